@@ -1,56 +1,93 @@
 import logging
 from typing import List, Optional
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing_extensions import Annotated
 
-from fastapi import Depends, Path, Query, APIRouter, HTTPException, Request, status
+from fastapi import Depends, Header, Path, Query, APIRouter, HTTPException, Request, Response, status
 from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.models.sql_models import RaceDriver, Race, Guess
-from app.models.pydantic_models import Standings
+from app.models.sql_models import RaceDriver, Guess
+from app.models.pydantic_models import RaceSummary, SessionDetails, Standings
+from app.core.config import settings
 from app.core.dependencies import (
     get_db_session,
+    get_async_db_session,
+    get_async_read_db_session,
     verify_token,
     get_race_service,
     get_user_service,
     get_race_driver_service,
     get_race_result_service,
-    event_queue,
+    get_standings_cache,
 )
 from app.services.database.race_service import RaceService
 from app.services.database.user_service import UserService
 from app.services.database.race_driver_service import RaceDriverService
 from app.services.database.race_result_service import RaceResultService
+from app.services.sse.session_update_hub import session_update_hub
+from app.services.cache.standings_cache import StandingsCache
+from app.services.cache.roster_cache import RosterCache
+from app.core.responses import model_response
+from app.utils.http_cache import format_http_date, is_not_modified, make_etag
 
 router = APIRouter()
 
 # Type aliases for dependency injection
 SessionDep = Annotated[Session, Depends(get_db_session)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db_session)]
+# Read-only routes, may be served by a replica that lags the primary by a few seconds
+AsyncReadSessionDep = Annotated[AsyncSession, Depends(get_async_read_db_session)]
 RaceServiceDep = Annotated[RaceService, Depends(get_race_service)]
 UserServiceDep = Annotated[UserService, Depends(get_user_service)]
 RaceDriverServiceDep = Annotated[RaceDriverService, Depends(get_race_driver_service)]
 RaceResultServiceDep = Annotated[RaceResultService, Depends(get_race_result_service)]
+StandingsCacheDep = Annotated[StandingsCache, Depends(get_standings_cache)]
 
 
-@router.get("/sessions", response_model=List[Race])
+race_summaries_adapter = TypeAdapter(List[RaceSummary])
+
+
+# Keyset paginated, the next page's cursor is returned in the X-Next-Cursor header
+@router.get("/sessions", response_model=List[RaceSummary])
 async def get_races(
-    session: SessionDep,
+    request: Request,
+    session: AsyncReadSessionDep,
     race_service: RaceServiceDep,
     limit: int = Query(
-        0, description="Number of latest races to return, or all races if omitted"
+        0, ge=0, description="Number of latest races to return, or all races if omitted"
     ),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    year: Optional[int] = Query(None, description="Only races of this season"),
+    session_type: Optional[str] = Query(None, description="Only sessions of this type, e.g. Race or Sprint"),
     _=Depends(verify_token),
 ):
     try:
-        races = race_service.get_races(session, limit)
+        race_page = await race_service.get_race_page_async(session, limit, cursor, year, session_type)
 
-        if not races:
+        if not race_page.races and not cursor:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="No races found"
             )
-        return races
 
+        body = race_summaries_adapter.dump_json(race_page.races)
+        etag = make_etag(body)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if race_page.last_modified is not None:
+            headers["Last-Modified"] = format_http_date(race_page.last_modified)
+        if race_page.next_cursor:
+            headers["X-Next-Cursor"] = race_page.next_cursor
+
+        if is_not_modified(request.headers, etag, race_page.last_modified):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except SQLAlchemyError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -67,19 +104,20 @@ async def get_races(
 @router.get("/session_drivers", response_model=List[RaceDriver])
 async def get_session_drivers(
     session_id: int,
-    session: SessionDep,
+    session: AsyncReadSessionDep,
     race_driver_service: RaceDriverServiceDep,
     _=Depends(verify_token),
 ):
     try:
-        session_drivers = race_driver_service.get_session_drivers(session, session_id)
+        roster = await race_driver_service.get_session_roster_async(session, session_id)
+        session_drivers = RosterCache.to_drivers(session_id, roster)
         if not session_drivers:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No drivers found for session with ID {session_id}",
             )
 
-        return session_drivers
+        return model_response(session_drivers, List[RaceDriver])
 
     except SQLAlchemyError as e:
         raise HTTPException(
@@ -95,7 +133,7 @@ async def get_session_drivers(
 
 @router.get("/guess/{event_id}", response_model=Optional[Guess])
 async def get_user_guess(
-    session: SessionDep,
+    session: AsyncSessionDep,
     user_service: UserServiceDep,
     verify_token: str = Depends(verify_token),
     event_id: int = Path(
@@ -104,9 +142,8 @@ async def get_user_guess(
 ):
     try:
         user_email = verify_token.get("email")
-        user_guess = user_service.get_guess(session, user_email, event_id)
-        print(user_guess)
-        return user_guess
+        user_guess = await user_service.get_guess_async(session, user_email, event_id)
+        return model_response(user_guess, Optional[Guess])
     except SQLAlchemyError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -119,8 +156,9 @@ async def get_user_guess(
         )
 
 
+# Plain def so the synchronous write runs in the threadpool instead of on the event loop
 @router.post("/guess", response_model=Guess)
-async def post_user_guess(
+def post_user_guess(
     guess: Guess,
     session: SessionDep,
     user_service: UserServiceDep,
@@ -146,19 +184,24 @@ async def post_user_guess(
         )
 
 
-# TODO how to do this, always fetch from F1 openapi,
-# or cache some and only request at regular intervals, probably need to use redis here
+# Served from a Redis snapshot, the sync and live ingestion tasks invalidate it when results change.
+# Rebuilds read the primary, a lagging replica would re-cache the standings that were just invalidated.
 @router.get("/session_standing", response_model=Standings)
 async def get_session_standing(
-    session: SessionDep,
+    session: AsyncSessionDep,
     race_result_service: RaceResultServiceDep,
+    standings_cache: StandingsCacheDep,
     session_key: int = Query(None, description="Session key of the requested results"),
     _=Depends(verify_token),
 ):
     try:
-        driver_numbers_in_top = race_result_service.get_race_standing(
-            session, session_key
-        )
+        async def build_standings() -> Standings:
+            return Standings(
+                session_key=session_key,
+                standings=await race_result_service.get_race_standing_async(session, session_key),
+            )
+
+        standings = await standings_cache.get_or_build_async(session_key, build_standings)
 
     except SQLAlchemyError as e:
         raise HTTPException(
@@ -173,19 +216,77 @@ async def get_session_standing(
         )
 
     logging.info(
-        f"Retrieved standings for session {session_key}: {driver_numbers_in_top}"
+        f"Retrieved standings for session {session_key}: {standings.standings}"
     )
-    return Standings(session_key=session_key, standings=driver_numbers_in_top)
+    return model_response(standings, Standings)
 
 
-async def event_stream(request: Request):
-    while True:
-        data = await event_queue.get()
-        logging.info(f"ARRIVED DATA: {data}")
-        yield f"data: {data}\n\n"
+# Season view in one round trip instead of three requests per session.
+# Reads the primary: the caller's guesses must include the one just posted and standings rebuilds
+# must not re-cache a lagging replica's results.
+@router.get("/session_batch", response_model=List[SessionDetails])
+async def get_session_batch(
+    session: AsyncSessionDep,
+    race_driver_service: RaceDriverServiceDep,
+    user_service: UserServiceDep,
+    race_result_service: RaceResultServiceDep,
+    standings_cache: StandingsCacheDep,
+    session_keys: List[int] = Query(..., description="Session keys to fetch, e.g. ?session_keys=9158&session_keys=9159"),
+    verify_token: str = Depends(verify_token),
+):
+    session_keys = list(dict.fromkeys(session_keys))
+    if len(session_keys) > settings.session_batch_max_keys:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.session_batch_max_keys} session keys per request",
+        )
+
+    try:
+        user_email = verify_token.get("email")
+        drivers = await race_driver_service.get_drivers_by_session_async(session, session_keys)
+        guesses = await user_service.get_guesses_async(session, user_email, session_keys)
+
+        # Only sessions with a result are built and cached, the others are answered without standings
+        async def build_standings(missing: List[int]) -> List[Standings]:
+            standings_by_session = await race_result_service.get_race_standings_async(session, missing)
+            return [
+                Standings(session_key=session_key, standings=session_standings)
+                for session_key, session_standings in standings_by_session.items()
+            ]
+
+        standings = await standings_cache.get_or_build_many_async(session_keys, build_standings)
+
+        sessions = [
+            SessionDetails(
+                session_key=session_key,
+                drivers=drivers.get(session_key, []),
+                guess=guesses.get(session_key),
+                standings=standings[session_key].standings if session_key in standings else [],
+            )
+            for session_key in session_keys
+        ]
+        return model_response(sessions, List[SessionDetails])
+
+    except SQLAlchemyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error occurred: {str(e)}",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"An unexpected error occurred: {str(e)}",
+        )
 
 
 # Experimental sse endpoint
 @router.get("/session_standing_sse")
-async def get_session_standing_sse(request: Request):
-    return StreamingResponse(event_stream(request), media_type="text/event-stream")
+async def get_session_standing_sse(
+    request: Request,
+    last_event_id: Optional[str] = Header(None, description="Id of the last event received before reconnecting"),
+):
+    return StreamingResponse(
+        session_update_hub.stream(request, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
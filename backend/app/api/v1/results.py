@@ -1,31 +1,66 @@
 from fastapi import Depends, APIRouter, HTTPException, Query, status
 from typing import Optional
 from typing_extensions import Annotated
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.sql_models import Guess
+from app.models.pydantic_models import LeaderboardPage
+from app.core.responses import model_response
 from app.services.database.race_result_service import RaceResultService
+from app.services.database.leaderboard_service import LeaderboardService
 
-from app.core.dependencies import get_db_session, verify_token, get_race_result_service
+from app.core.dependencies import (
+    get_async_read_db_session,
+    verify_token,
+    get_race_result_service,
+    get_leaderboard_service,
+)
 
 router = APIRouter()
 
-SessionDep = Annotated[Session, Depends(get_db_session)]
+# Read-only routes, may be served by a replica that lags the primary by a few seconds
+AsyncReadSessionDep = Annotated[AsyncSession, Depends(get_async_read_db_session)]
 RaceResultServiceDep = Annotated[RaceResultService, Depends(get_race_result_service)]
+LeaderboardServiceDep = Annotated[LeaderboardService, Depends(get_leaderboard_service)]
 
 
 @router.get("/winners", response_model=Optional[Guess])
 async def get_winners(
-    session: SessionDep,
+    session: AsyncReadSessionDep,
     race_result_service: RaceResultServiceDep,
     session_key: int = Query(None, description="Session key of the requested results"),
     _=Depends(verify_token),
 ):
     try:
-        winning_guess = race_result_service.get_winning_guess(session, session_key)
-        return winning_guess
+        winning_guess = await race_result_service.get_winning_guess_async(session, session_key)
+        return model_response(winning_guess, Optional[Guess])
+    except SQLAlchemyError as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error occurred: {str(e)}",
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"An unexpected error occurred: {str(e)}",
+        )
+
+
+@router.get("/leaderboard", response_model=LeaderboardPage)
+async def get_leaderboard(
+    session: AsyncReadSessionDep,
+    leaderboard_service: LeaderboardServiceDep,
+    season: int = Query(..., description="Season (year) of the leaderboard"),
+    page: int = Query(1, ge=1, description="Page number, starting at 1"),
+    page_size: int = Query(50, ge=1, le=200, description="Number of entries per page"),
+    _=Depends(verify_token),
+):
+    try:
+        leaderboard = await leaderboard_service.get_leaderboard_async(session, season, page, page_size)
+        return model_response(leaderboard, LeaderboardPage)
     except SQLAlchemyError as e:
-        session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error occurred: {str(e)}",
@@ -36,4 +71,3 @@ async def get_winners(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"An unexpected error occurred: {str(e)}",
         )
-    
@@ -2,30 +2,35 @@ from sqlmodel import Session
 from typing_extensions import Annotated
 import requests as req
 from fastapi import Depends, APIRouter, HTTPException
-from google.oauth2 import id_token
-from google.auth.transport import requests
+from google.auth.exceptions import GoogleAuthError, TransportError
 from app.models.user import GoogleAuthorizationToken, AccessToken, UserInfo
-from app.core.dependencies import create_access_token, get_db_session, verify_token, get_user_service
-from app.core.config import settings
+from app.core.dependencies import (
+    create_access_token,
+    get_db_session,
+    verify_token,
+    get_user_service,
+    get_google_token_verifier,
+)
 from app.services.database.user_service import UserService
+from app.services.google.google_token_verifier import GoogleTokenVerifier
 
 router = APIRouter()
 
 SessionDep = Annotated[Session, Depends(get_db_session)]
 UserServiceDep = Annotated[UserService, Depends(get_user_service)]
+GoogleTokenVerifierDep = Annotated[GoogleTokenVerifier, Depends(get_google_token_verifier)]
 
 
+# Plain def so a certs fetch and the user insert run in the threadpool instead of on the event loop
 @router.post("/auth/google", response_model=UserInfo)
-async def google_auth(
+def google_auth(
     request: GoogleAuthorizationToken,
     db: SessionDep,
     user_service: UserServiceDep,
+    google_token_verifier: GoogleTokenVerifierDep,
 ) -> UserInfo:
-    client_id = settings.client_id
     try:
-        id_user_info = id_token.verify_oauth2_token(
-            request.auth_token, requests.Request(), client_id, 10
-        )
+        id_user_info = google_token_verifier.verify(request.auth_token)
         # Create a JWT token and return it
         access_token = create_access_token(
             data={"name": id_user_info.get("name"), "email": id_user_info.get("email")}
@@ -40,5 +45,9 @@ async def google_auth(
             email=id_user_info.get("email"),
             access_token=AccessToken(access_token=access_token),
         )
+    except TransportError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except (ValueError, GoogleAuthError) as e:
+        raise HTTPException(status_code=401, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,24 +1,58 @@
+from typing import List, Optional
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.datastructures import QueryParams
 from app.api.v1.api_router import api_router
+from app.core.config import settings
+from app.core.container import get_http_response_cache
+from app.core.metrics import metrics_router
+from app.core.middleware import CachePolicy, PrometheusMiddleware, ResponseCacheMiddleware
+from app.services.cache.http_response_cache import SESSIONS_TAG, race_tag
 
 allowed_origins = ["*"]
 
 
+def _race_tags(parameter: str):
+    """Tag a per-race route by the race id in its query, requests without one aren't cached."""
+    def tags(query_params: QueryParams) -> Optional[List[str]]:
+        value = query_params.get(parameter)
+        return [race_tag(int(value))] if value and value.isdigit() else None
+    return tags
+
+
+# Routes whose response is the same for every user and only changes when the sync writes
+response_cache_policies = {
+    "/f1/sessions": CachePolicy(settings.response_cache_sessions_ttl, lambda query_params: [SESSIONS_TAG]),
+    "/f1/session_drivers": CachePolicy(settings.response_cache_race_ttl, _race_tags("session_id")),
+    # Guesses are closed before a race starts, so only a results write can change its winners
+    "/results/winners": CachePolicy(settings.response_cache_race_ttl, _race_tags("session_key")),
+}
+
+
 class Application(FastAPI):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.include_router(api_router)
+        if settings.metrics_enabled and settings.metrics_token:
+            self.include_router(metrics_router)
+        self.add_middlewares()
+
+    def add_middlewares(self):
+        # Each middleware wraps the ones added before it
+        super().add_middleware(
+            ResponseCacheMiddleware, get_cache=get_http_response_cache, policies=response_cache_policies
+        )
         super().add_middleware(
             CORSMiddleware,
             allow_origins=allowed_origins,
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=["ETag", "Last-Modified", "X-Next-Cursor"],
         )
-        self.include_router(api_router)
-
-    def add_middlewares(self):
-        pass
+        if settings.metrics_enabled:
+            # Outermost, so its timing includes CORS handling and cache hits
+            super().add_middleware(PrometheusMiddleware)
 
     def add_event_handlers(self):
         pass
@@ -0,0 +1,156 @@
+"""
+Verification of the application's HS256 access tokens.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import jwt
+
+from app.core.config import settings
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def decode_hs256(token: str, secret_key: str) -> Dict:
+    """
+    Minimal HS256 verification: signature and exp only, which is all create_access_token puts in a token.
+    Raises the same PyJWT exceptions as jwt.decode so callers handle both backends alike.
+    """
+    try:
+        header_segment, payload_segment, signature_segment = token.split(".")
+        header = json.loads(_b64url_decode(header_segment))
+        signature = _b64url_decode(signature_segment)
+    except (ValueError, TypeError) as e:
+        raise jwt.DecodeError(f"Invalid token: {e}")
+
+    if not isinstance(header, dict) or header.get("alg") != "HS256":
+        raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+
+    signing_input = f"{header_segment}.{payload_segment}".encode()
+    expected = hmac.new(secret_key.encode(), signing_input, hashlib.sha256).digest()
+    if not hmac.compare_digest(signature, expected):
+        raise jwt.InvalidSignatureError("Signature verification failed")
+
+    try:
+        payload = json.loads(_b64url_decode(payload_segment))
+    except ValueError as e:
+        raise jwt.DecodeError(f"Invalid payload: {e}")
+    if not isinstance(payload, dict):
+        raise jwt.DecodeError("Invalid payload")
+
+    exp = payload.get("exp")
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise jwt.DecodeError("Expiration Time claim (exp) must be an integer.")
+        if exp <= time.time():
+            raise jwt.ExpiredSignatureError("Signature has expired")
+    return payload
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of token payloads that already passed verification.
+    Keyed by the token's SHA-256 so raw tokens aren't kept in memory, an entry expires at the token's exp.
+    """
+
+    def __init__(self, max_size: int = 4096, max_ttl_seconds: float = 300.0):
+        self.max_size = max_size
+        self.max_ttl_seconds = max_ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return payload
+
+    def put(self, token: str, payload: Dict) -> None:
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        key = self.key(token)
+        expires_at = min(exp, time.time() + self.max_ttl_seconds)
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class TokenVerifier:
+    """Verify access tokens with PyJWT or the minimal HMAC backend, remembering tokens that passed."""
+
+    BACKENDS = ("pyjwt", "hmac")
+
+    def __init__(self, secret_key: str, backend: str = "pyjwt", cache: Optional[VerifiedTokenCache] = None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown token verification backend {backend!r}, expected one of {self.BACKENDS}")
+        self.secret_key = secret_key
+        self.backend = backend
+        self.cache = cache
+
+    @classmethod
+    def from_settings(cls) -> "TokenVerifier":
+        cache = (
+            VerifiedTokenCache(settings.token_cache_size, settings.token_cache_max_ttl)
+            if settings.token_cache_size > 0
+            else None
+        )
+        return cls(settings.secret_key, settings.token_verify_backend, cache)
+
+    def _decode(self, token: str) -> Dict:
+        if self.backend == "hmac":
+            return decode_hs256(token, self.secret_key)
+        return jwt.decode(token, self.secret_key, algorithms=["HS256"])
+
+    def verify(self, token: str) -> Dict:
+        """
+        Return the payload of a valid token.
+        Raises:
+            jwt.PyJWTError: If the token is invalid or expired
+        """
+        if self.cache is not None:
+            payload = self.cache.get(token)
+            if payload is not None:
+                return payload
+
+        payload = self._decode(token)
+        if self.cache is not None:
+            self.cache.put(token, payload)
+        return payload
+
+
+@lru_cache(maxsize=1)
+def get_token_verifier() -> TokenVerifier:
+    """Get the singleton token verifier."""
+    return TokenVerifier.from_settings()
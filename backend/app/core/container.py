@@ -3,16 +3,26 @@ Dependency injection container for the F1 application.
 Provides centralized service creation and dependency management.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from functools import lru_cache
 import logging
 
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.services.cache.standings_cache import StandingsCache
+from app.services.cache.roster_cache import RosterCache
+from app.services.cache.http_response_cache import HttpResponseCache
+from app.services.cache.live_tracker_store import LiveTrackerStore
 from app.services.f1openapi.f1_api_service import F1API
+from app.services.google.google_token_verifier import GoogleCertsCache, GoogleTokenVerifier
 from app.services.database.database_service import DatabaseService
 from app.services.database.race_service import RaceService
 from app.services.database.race_driver_service import RaceDriverService
 from app.services.database.race_result_service import RaceResultService
 from app.services.database.user_service import UserService
+from app.services.database.leaderboard_service import LeaderboardService
 
 logger = logging.getLogger(__name__)
 
@@ -31,22 +41,85 @@ class ServiceContainer:
         logger.info("Initializing service container...")
         
         # Initialize core services
+        self._services['redis'] = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+        self._services['async_redis'] = aioredis.Redis.from_url(settings.redis_url, decode_responses=True)
+        self._services['standings_cache'] = StandingsCache(
+            self._services['redis'],
+            self._services['async_redis'],
+            ttl_seconds=settings.standings_cache_ttl,
+        )
+        self._services['roster_cache'] = RosterCache(
+            settings.roster_cache_size,
+            self._services['redis'] if settings.roster_cache_redis else None,
+            self._services['async_redis'] if settings.roster_cache_redis else None,
+            settings.roster_cache_redis_ttl,
+            settings.roster_cache_local_ttl,
+        )
+        self._services['http_response_cache'] = self._create_http_response_cache()
         self._services['f1_api'] = F1API()
-        self._services['database_service'] = DatabaseService(self._services['f1_api'])
+        self._services['google_token_verifier'] = GoogleTokenVerifier(GoogleCertsCache())
+        self._services['database_service'] = DatabaseService(
+            self._services['f1_api'],
+            standings_cache=self._services['standings_cache'],
+            roster_cache=self._services['roster_cache'],
+            http_response_cache=self._services['http_response_cache'],
+            live_tracker_store=LiveTrackerStore(self._services['redis']),
+        )
         self._services['race_service'] = RaceService()
-        self._services['race_driver_service'] = RaceDriverService()
+        self._services['race_driver_service'] = RaceDriverService(self._services['roster_cache'])
         self._services['race_result_service'] = RaceResultService()
-        self._services['user_service'] = UserService()
+        self._services['user_service'] = UserService(self._services['race_driver_service'])
+        self._services['leaderboard_service'] = LeaderboardService()
         
         self._initialized = True
         logger.info("Service container initialized successfully")
     
+    def _create_http_response_cache(self) -> Optional[HttpResponseCache]:
+        """Create the HTTP response cache from settings, or None if it is disabled."""
+        if settings.response_cache_backend == "redis":
+            return HttpResponseCache(
+                self._services['redis'], self._services['async_redis'], settings.response_cache_max_entries
+            )
+        if settings.response_cache_backend == "memory":
+            return HttpResponseCache(max_entries=settings.response_cache_max_entries)
+        return None
+
+    def get_redis(self) -> redis.Redis:
+        """Get shared Redis client."""
+        if not self._initialized:
+            self.initialize()
+        return self._services['redis']
+
+    def get_standings_cache(self) -> StandingsCache:
+        """Get standings snapshot cache instance."""
+        if not self._initialized:
+            self.initialize()
+        return self._services['standings_cache']
+
+    def get_roster_cache(self) -> RosterCache:
+        """Get per-race driver roster cache instance."""
+        if not self._initialized:
+            self.initialize()
+        return self._services['roster_cache']
+
+    def get_http_response_cache(self) -> Optional[HttpResponseCache]:
+        """Get HTTP response cache instance, None when disabled."""
+        if not self._initialized:
+            self.initialize()
+        return self._services['http_response_cache']
+
     def get_f1_api(self) -> F1API:
         """Get F1 API service instance."""
         if not self._initialized:
             self.initialize()
         return self._services['f1_api']
     
+    def get_google_token_verifier(self) -> GoogleTokenVerifier:
+        """Get Google ID token verifier instance."""
+        if not self._initialized:
+            self.initialize()
+        return self._services['google_token_verifier']
+
     def get_database_service(self) -> DatabaseService:
         """Get database synchronization service instance."""
         if not self._initialized:
@@ -77,6 +150,12 @@ class ServiceContainer:
             self.initialize()
         return self._services['user_service']
 
+    def get_leaderboard_service(self) -> LeaderboardService:
+        """Get leaderboard service instance."""
+        if not self._initialized:
+            self.initialize()
+        return self._services['leaderboard_service']
+
     def reset(self) -> None:
         """Reset the container (mainly for testing)."""
         self._services.clear()
@@ -91,11 +170,26 @@ def get_container() -> ServiceContainer:
 
 
 # FastAPI dependency functions
+def get_standings_cache() -> StandingsCache:
+    """FastAPI dependency for standings snapshot cache."""
+    return get_container().get_standings_cache()
+
+
 def get_f1_api() -> F1API:
     """FastAPI dependency for F1 API service."""
     return get_container().get_f1_api()
 
 
+def get_http_response_cache() -> Optional[HttpResponseCache]:
+    """Shared HTTP response cache, None when disabled."""
+    return get_container().get_http_response_cache()
+
+
+def get_google_token_verifier() -> GoogleTokenVerifier:
+    """FastAPI dependency for the Google ID token verifier."""
+    return get_container().get_google_token_verifier()
+
+
 def get_database_service() -> DatabaseService:
     """FastAPI dependency for database service."""
     return get_container().get_database_service()
@@ -118,4 +212,9 @@ def get_race_result_service() -> RaceResultService:
 
 def get_user_service() -> UserService:
     """FastAPI dependency for user service."""
-    return get_container().get_user_service()
\ No newline at end of file
+    return get_container().get_user_service()
+
+
+def get_leaderboard_service() -> LeaderboardService:
+    """FastAPI dependency for leaderboard service."""
+    return get_container().get_leaderboard_service()
\ No newline at end of file
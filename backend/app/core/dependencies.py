@@ -1,7 +1,5 @@
-import asyncio
 import logging
-import threading
-from typing import Generator
+from typing import AsyncGenerator, Generator
 import jwt
 import datetime
 from fastapi import Depends, HTTPException, Request
@@ -9,43 +7,38 @@ from fastapi.security import (
     HTTPAuthorizationCredentials,
     HTTPBearer,
 )
-import redis
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.auth import get_token_verifier
 from app.core.config import settings
+from app.core.metrics import dependency_span
+from app.core.middleware import READ_FROM_PRIMARY_KEY
 from app.services.database.connector import get_db_manager
 
 
 from app.core.container import (
     get_f1_api,
+    get_google_token_verifier,
     get_database_service, 
     get_race_service,
     get_race_driver_service,
     get_race_result_service,
-    get_user_service
+    get_user_service,
+    get_standings_cache,
+    get_leaderboard_service,
 )
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 oauth2_scheme = HTTPBearer()
 
-r = redis.Redis(host='localhost', port=6379, decode_responses=True)
-event_queue = asyncio.Queue()
 
-def redis_listener():
-    pubsub = r.pubsub()
-    pubsub.subscribe('session_updates')
-    for message in pubsub.listen():
-        asyncio.run(event_queue.put(str(message['data'])))
-
-threading.Thread(target=redis_listener, daemon=True).start()
-
-
-def verify_token(token: HTTPAuthorizationCredentials = Depends(oauth2_scheme)):
+# Async because verification is a few microseconds of CPU, a threadpool hop would cost more than the work
+async def verify_token(token: HTTPAuthorizationCredentials = Depends(oauth2_scheme)):
     """Verify JWT token and return payload."""
     try:
-        payload = jwt.decode(
-            token.credentials, settings.secret_key, algorithms=["HS256"]
-        )
+        with dependency_span("auth", "verify_token"):
+            payload = get_token_verifier().verify(token.credentials)
         return payload
     except jwt.PyJWTError as e:
         print(e)
@@ -74,3 +67,26 @@ def get_db_session() -> Generator[Session, None, None]:
     """
     with get_db_manager().get_session_context() as session:
         yield session
+
+
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency for async database sessions.
+    Use it in async routes so queries don't block the event loop.
+    """
+    async with get_db_manager().get_async_session_context() as session:
+        yield session
+
+
+async def get_async_read_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency for read-only async database sessions.
+    Served by a read replica when one is configured and fresh enough, otherwise by the primary.
+    Responses rendered for the response cache always read the primary.
+    """
+    if request.scope.get(READ_FROM_PRIMARY_KEY):
+        session_context = get_db_manager().get_async_session_context()
+    else:
+        session_context = get_db_manager().get_async_read_session_context()
+    async with session_context as session:
+        yield session
@@ -0,0 +1,96 @@
+"""
+Prometheus metrics shared by the application, served on /metrics to scrapers holding the metrics token.
+"""
+
+import hmac
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# HTTP requests, labelled with the route template so path parameters don't explode the label set
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last body chunk",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS = Counter("http_requests_total", "Handled requests", ["method", "route", "status"])
+HTTP_REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being handled", ["method"])
+
+# Calls to what the API depends on: the F1 open API, the database, Redis and token verification
+DEPENDENCY_SECONDS = Histogram(
+    "dependency_duration_seconds",
+    "Time spent in calls to a dependency",
+    ["dependency", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+DEPENDENCY_ERRORS = Counter("dependency_errors_total", "Calls to a dependency that raised", ["dependency", "operation"])
+
+# Connection pool
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a connection from the pool",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after pool_timeout seconds",
+    ["engine"],
+)
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured number of pooled connections", ["engine"])
+DB_POOL_IN_USE = Gauge("db_pool_connections_in_use", "Connections currently checked out", ["engine"])
+DB_POOL_IDLE = Gauge("db_pool_connections_idle", "Connections idle in the pool", ["engine"])
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections above pool_size, negative while the pool is still filling", ["engine"]
+)
+DB_SLOW_QUERIES = Counter("db_slow_queries_total", "Statements slower than db_slow_query_ms", ["engine"])
+
+# In-process and Redis caches of the application, e.g. cache="roster" result="redis_hits"
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Cache lookups by outcome", ["cache", "result"])
+CACHE_INVALIDATIONS = Counter("cache_invalidations_total", "Cache entries invalidated", ["cache"])
+
+
+@contextmanager
+def dependency_span(dependency: str, operation: str) -> Iterator[None]:
+    """
+    Time a call to a dependency, works around awaits as well.
+    Args:
+        dependency: What is called, e.g. "redis"
+        operation: Low-cardinality name of the call, e.g. "publish"
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        DEPENDENCY_ERRORS.labels(dependency, operation).inc()
+        raise
+    finally:
+        DEPENDENCY_SECONDS.labels(dependency, operation).observe(time.perf_counter() - started)
+
+
+def verify_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    """Require the scraper's `Authorization: Bearer <METRICS_TOKEN>` header."""
+    expected = f"Bearer {settings.metrics_token}"
+    if not settings.metrics_token or not hmac.compare_digest((authorization or "").encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False, dependencies=[Depends(verify_metrics_token)])
+def get_metrics() -> Response:
+    """Endpoint for the Prometheus scraper, mounted only when a metrics_token is configured."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
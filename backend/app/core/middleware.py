@@ -0,0 +1,203 @@
+"""
+ASGI middlewares of the F1 application.
+"""
+
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+import jwt
+import redis
+from starlette.datastructures import Headers, QueryParams
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.auth import get_token_verifier
+from app.core.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS, HTTP_REQUESTS_IN_FLIGHT, dependency_span
+from app.services.cache.http_response_cache import CachedHttpResponse, HttpResponseCache
+from app.utils.http_cache import is_not_modified, make_etag
+
+# Scope keys set by ResponseCacheMiddleware: the route path of a cache hit, which never reaches the router,
+# and a flag telling read-only dependencies to use the primary for a response that will be cached
+CACHED_ROUTE_PATH_KEY = "f1.cached_route_path"
+READ_FROM_PRIMARY_KEY = "f1.read_from_primary"
+
+
+class PrometheusMiddleware:
+    """
+    Records per-route latency, status codes and in-flight requests.
+    A plain ASGI middleware rather than BaseHTTPMiddleware, so it adds no extra task or body copy per request.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: tuple = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            # The router stores the matched route in the shared scope, cache hits store their path instead
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or scope.get(CACHED_ROUTE_PATH_KEY) or "unmatched"
+            HTTP_REQUEST_SECONDS.labels(method, route_path).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, route_path, str(status_code)).inc()
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    How long a route's responses may be cached, and the tags whose invalidation drops them.
+    tags receives the query parameters and returns None when the request must not be cached.
+    """
+    ttl_seconds: int
+    tags: Callable[[QueryParams], Optional[List[str]]]
+
+
+class ResponseCacheMiddleware:
+    """
+    Serves GET responses of the configured routes from an HttpResponseCache.
+    Hits, and matching If-None-Match revalidations answered with 304, never reach the route or the database.
+    Only routes whose response is the same for every authenticated user may be configured, the token is
+    still verified before a cached response is served.
+    """
+
+    # Headers replayed from the original response, ETag is recomputed from the body
+    STORED_HEADERS = ("content-type", "cache-control", "last-modified", "x-next-cursor")
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        get_cache: Callable[[], Optional[HttpResponseCache]],
+        policies: Dict[str, CachePolicy],
+        max_body_bytes: int = 512 * 1024,
+    ):
+        self.app = app
+        # Resolved per request, the service container is only initialized once the app starts
+        self.get_cache = get_cache
+        self.policies = policies
+        self.max_body_bytes = max_body_bytes
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _is_authenticated(request: Request) -> bool:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            get_token_verifier().verify(token)
+            return True
+        except jwt.PyJWTError:
+            return False
+
+    @staticmethod
+    def _cached_response(entry: CachedHttpResponse, request: Request, hit: str) -> Response:
+        headers = dict(entry.headers)
+        headers["ETag"] = entry.etag
+        headers["X-Cache"] = hit
+        last_modified = headers.get("last-modified")
+        if is_not_modified(
+            request.headers, entry.etag, parsedate_to_datetime(last_modified) if last_modified else None
+        ):
+            headers.pop("content-type", None)
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, headers=headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        policy = self.policies.get(scope["path"]) if scope["type"] == "http" else None
+        cache = self.get_cache() if policy is not None else None
+        if cache is None or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        tags = policy.tags(request.query_params)
+        # Unauthenticated requests go through so the route answers them with its own 401/403
+        if tags is None or not self._is_authenticated(request):
+            await self.app(scope, receive, send)
+            return
+
+        query = urlencode(sorted(request.query_params.multi_items()))
+        request_key = f"{scope['path']}?{query}"
+        try:
+            with dependency_span("redis", "response_cache_get"):
+                entry, generations = await cache.lookup_async(request_key, tags)
+        except redis.RedisError as e:
+            self.logger.error(f"Response cache unavailable: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        if entry is not None:
+            scope[CACHED_ROUTE_PATH_KEY] = scope["path"]
+            await self._cached_response(entry, request, "HIT")(scope, receive, send)
+            return
+
+        # Buffer the route's response, JSON bodies of these routes are small
+        start: Optional[Message] = None
+        body = bytearray()
+
+        async def buffer(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+
+        # Render the full response even for conditional requests, so there is something to store.
+        # Read the primary: a lagging replica would store pre-invalidation data under the new generation.
+        route_scope = dict(scope)
+        route_scope[READ_FROM_PRIMARY_KEY] = True
+        route_scope["headers"] = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in (b"if-none-match", b"if-modified-since")
+        ]
+        await self.app(route_scope, receive, buffer)
+        # Outer middlewares read the matched route from the scope
+        if "route" in route_scope:
+            scope["route"] = route_scope["route"]
+        if start is None:
+            return
+
+        response_headers = Headers(raw=start["headers"])
+        cacheable = (
+            start["status"] == 200
+            and response_headers.get("content-type", "").startswith("application/json")
+            and len(body) <= self.max_body_bytes
+        )
+        if not cacheable:
+            await send(start)
+            await send({"type": "http.response.body", "body": bytes(body)})
+            return
+
+        entry = CachedHttpResponse(
+            body=bytes(body),
+            etag=make_etag(bytes(body)),
+            headers=[(name, response_headers[name]) for name in self.STORED_HEADERS if name in response_headers],
+        )
+        try:
+            await cache.set_async(request_key, entry, generations, policy.ttl_seconds)
+        except redis.RedisError as e:
+            self.logger.error(f"Could not store response of {request_key}: {e}")
+        await self._cached_response(entry, request, "MISS")(scope, receive, send)
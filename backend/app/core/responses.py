@@ -0,0 +1,47 @@
+"""
+Fast JSON response classes, opted into per route.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+from app.core.config import settings
+
+__all__ = ["ModelJSONResponse", "model_response"]
+
+
+@lru_cache(maxsize=None)
+def _adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+class ModelJSONResponse(Response):
+    """
+    Serializes models that were already validated when they were read (ORM rows, cached snapshots)
+    straight to JSON bytes with pydantic-core, skipping response_model re-validation and jsonable_encoder.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content: Any, annotation: Any, **kwargs):
+        self.annotation = annotation
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return _adapter(self.annotation).dump_json(content)
+
+
+def model_response(content: Any, annotation: Any, **kwargs) -> Any:
+    """
+    Return content through the fast path when it is enabled, otherwise as-is for FastAPI's
+    default response_model validation.
+    Args:
+        content: Models matching the route's response_model
+        annotation: The route's response_model, e.g. List[RaceDriver]
+    """
+    if not settings.fast_json_responses:
+        return content
+    return ModelJSONResponse(content, annotation, **kwargs)
@@ -4,6 +4,7 @@ from app.core.app_base import Application
 from app.core.config import settings
 from app.services.database.connector import get_db_manager
 from app.core.container import get_container
+from app.services.sse.session_update_hub import session_update_hub
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,12 @@ async def lifespan(app: FastAPI):
     # Initialize the service container
     container = get_container()
     container.initialize()
+
+    # Fail fast when the schema is behind, this only reads the migration version
+    get_db_manager()
+
+    # Start broadcasting session updates to SSE clients
+    await session_update_hub.start()
     
     logger.info("F1 application startup complete")
     
@@ -27,9 +34,16 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down F1 application...")
+
+    await session_update_hub.stop()
     
     # Close database connections
+    await get_db_manager().close_async()
     get_db_manager().close()
+
+    # Close pooled F1 API and Google certs connections
+    container.get_f1_api().close()
+    container.get_google_token_verifier().certs_cache.close()
     
     # Reset container if needed
     if hasattr(app.state, 'container'):
@@ -1,5 +1,27 @@
-from pydantic import BaseModel
-from typing import List
+from datetime import datetime, timezone
+from pydantic import BaseModel, field_serializer
+from typing import List, Optional
+from app.models.sql_models import Guess, RaceDriver
+
+class RaceSummary(BaseModel):
+    """Projection of a race row for the session list, built without hydrating ORM objects."""
+    race_id: int
+    race_name: str
+    race_type: str
+    race_date: datetime
+
+    @field_serializer("race_date")
+    def serialize_race_date(self, race_date: datetime) -> str:
+        # Same format as Race.race_date
+        return race_date.replace(tzinfo=timezone.utc).isoformat()
+
+
+class RacePage(BaseModel):
+    races: List[RaceSummary]
+    next_cursor: Optional[str] = None
+    # Most recent sync of any race on the page, used as Last-Modified
+    last_modified: Optional[datetime] = None
+
 
 class DriverPosition(BaseModel):
     position: int
@@ -10,3 +32,29 @@ class DriverPosition(BaseModel):
 class Standings(BaseModel):
     session_key: int
     standings: List[DriverPosition]
+
+
+class SessionDetails(BaseModel):
+    """Everything a season view shows about one session, returned by /f1/session_batch."""
+    session_key: int
+    drivers: List[RaceDriver]
+    guess: Optional[Guess] = None
+    standings: List[DriverPosition]
+
+
+class LeaderboardRow(BaseModel):
+    rank: int
+    user_id: int
+    username: str
+    points: int
+    exact_positions: int
+    podium_positions: int
+    races_scored: int
+
+
+class LeaderboardPage(BaseModel):
+    season: int
+    page: int
+    page_size: int
+    total: int
+    entries: List[LeaderboardRow]
@@ -1,5 +1,7 @@
-from sqlmodel import Column, Integer, String, SQLModel, Field, Relationship, ForeignKey
+from sqlmodel import Column, Integer, String, SQLModel, Field, Relationship, ForeignKey, UniqueConstraint, Index
 from typing import Optional, List
+from datetime import datetime, timezone
+from pydantic import field_serializer
 
 
 class User(SQLModel, table=True):
@@ -10,10 +12,15 @@ class User(SQLModel, table=True):
 
 
 class Race(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_race_race_date_race_id", "race_date", "race_id"),
+    )
+
     race_id: Optional[int] = Field(default=None, primary_key=True)
     race_name: str = Field(max_length=100)
     race_type: str = Field(max_length=100)
-    race_date: str
+    # Session start, stored as naive UTC
+    race_date: datetime
 
     race_drivers: List["RaceDriver"] = Relationship(
         back_populates="race", cascade_delete=True
@@ -23,8 +30,17 @@ class Race(SQLModel, table=True):
         back_populates="race", cascade_delete=True
     )
 
+    @field_serializer("race_date")
+    def serialize_race_date(self, race_date: datetime) -> str:
+        # Keep the explicit UTC offset the API returned when race_date was stored as a string
+        return race_date.replace(tzinfo=timezone.utc).isoformat()
+
 
 class RaceDriver(SQLModel, table=True):
+    __table_args__ = (
+        UniqueConstraint("race_id", "driver_number", name="uq_racedriver_race_driver_number"),
+    )
+
     race_driver_id: Optional[int] = Field(default=None, primary_key=True)
     race_id: int = Field(
         sa_column=Column(Integer, ForeignKey("race.race_id", ondelete="CASCADE"))
@@ -37,6 +53,17 @@ class RaceDriver(SQLModel, table=True):
 
 
 class Guess(SQLModel, table=True):
+    __table_args__ = (
+        UniqueConstraint("user_id", "race_id", name="uq_guess_user_race"),
+        Index(
+            "ix_guess_race_positions",
+            "race_id",
+            "position_1_driver_id",
+            "position_2_driver_id",
+            "position_3_driver_id",
+        ),
+    )
+
     guess_id: Optional[int] = Field(default=None, primary_key=True)
     user_id: Optional[int] = Field(
         sa_column=Column(
@@ -65,8 +92,17 @@ class Guess(SQLModel, table=True):
     user: User = Relationship(back_populates="guesses")
     race: Race = Relationship(back_populates="guesses")
 
+    @field_serializer("user_id")
+    def serialize_user_id(self, user_id: Optional[int]) -> Optional[int]:
+        # The column is a string, rows read back carry "1" where the API returns 1
+        return None if user_id is None else int(user_id)
+
 
 class RaceResult(SQLModel, table=True):
+    __table_args__ = (
+        UniqueConstraint("race_id", name="uq_raceresult_race_id"),
+    )
+
     race_result_id: Optional[int] = Field(default=None, primary_key=True)
     race_id: int = Field(
         sa_column=Column(
@@ -79,3 +115,61 @@ class RaceResult(SQLModel, table=True):
     position_3_driver_id: int
 
     race: "Race" = Relationship(back_populates="race_result")
+
+
+# Per-session progress of the F1 open API sync, a row exists once the session itself is synced
+class SyncState(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_syncstate_results_pending", "results_synced", "session_start"),
+        Index("ix_syncstate_session_window", "session_start", "session_end"),
+    )
+
+    race_id: int = Field(
+        sa_column=Column(
+            Integer,
+            ForeignKey("race.race_id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    session_start: Optional[datetime] = None
+    session_end: Optional[datetime] = None
+    drivers_synced: bool = False
+    results_synced: bool = False
+    last_synced_at: Optional[datetime] = None
+
+
+# Points awarded to a single guess, kept so a re-scored race only applies the difference
+class GuessScore(SQLModel, table=True):
+    guess_id: int = Field(
+        sa_column=Column(
+            Integer,
+            ForeignKey("guess.guess_id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    race_id: int = Field(index=True)
+    user_id: int
+    season: int
+    points: int = 0
+    exact_positions: int = 0
+    podium_positions: int = 0
+
+
+# Materialized per-user season totals read by the leaderboard endpoint
+class LeaderboardEntry(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_leaderboardentry_season_points", "season", "points"),
+    )
+
+    season: int = Field(primary_key=True)
+    user_id: int = Field(
+        sa_column=Column(
+            Integer,
+            ForeignKey("user.user_id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    points: int = 0
+    exact_positions: int = 0
+    podium_positions: int = 0
+    races_scored: int = 0
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+# Tag of every /f1/sessions response, bumped when races are added
+SESSIONS_TAG = "sessions"
+
+
+def race_tag(race_id: int) -> str:
+    """Tag of the responses about a single race, bumped when its drivers or results change."""
+    return f"race:{race_id}"
+
+
+@dataclass
+class CachedHttpResponse:
+    """A cached 200 response body with the headers needed to replay it."""
+    body: bytes
+    etag: str
+    headers: List[Tuple[str, str]] = field(default_factory=list)
+    # Generation of every tag when the response was stored, a bumped generation invalidates it
+    generations: Dict[str, int] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "body": self.body.decode(),
+                "etag": self.etag,
+                "headers": self.headers,
+                "generations": self.generations,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, payload: str) -> "CachedHttpResponse":
+        data = json.loads(payload)
+        return cls(
+            body=data["body"].encode(),
+            etag=data["etag"],
+            headers=[tuple(header) for header in data["headers"]],
+            generations=data["generations"],
+        )
+
+
+class HttpResponseCache:
+    """
+    Shared store of rendered API responses, invalidated by tag.
+
+    Each tag (e.g. "sessions", "race:9158") has a generation counter. An entry remembers the generations
+    of its tags, so invalidating a tag is a single INCR and a lookup is a single MGET of the entry and its
+    tags' generations. Without Redis it falls back to an in-process LRU, which only the same process can
+    invalidate.
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        async_redis_client: Optional[aioredis.Redis] = None,
+        max_entries: int = 1024,
+        namespace: str = "http_cache",
+    ):
+        self.redis = redis_client
+        self.async_redis = async_redis_client
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self.logger = logging.getLogger(__name__)
+        self._entries: "OrderedDict[str, Tuple[float, CachedHttpResponse]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "invalidations": 0}
+
+    def entry_key(self, request_key: str) -> str:
+        return f"{self.namespace}:entry:{hashlib.sha1(request_key.encode()).hexdigest()}"
+
+    def generation_key(self, tag: str) -> str:
+        return f"{self.namespace}:gen:{tag}"
+
+    @staticmethod
+    def _is_current(entry: CachedHttpResponse, generations: Dict[str, int]) -> bool:
+        return all(entry.generations.get(tag, 0) == generation for tag, generation in generations.items())
+
+    async def lookup_async(
+        self, request_key: str, tags: List[str]
+    ) -> Tuple[Optional[CachedHttpResponse], Dict[str, int]]:
+        """
+        Return the cached response, unless one of its tags was invalidated since it was stored,
+        along with the tags' current generations to pass to set_async on a miss.
+        """
+        if self.async_redis is None:
+            return self._lookup_local(request_key, tags)
+
+        values = await self.async_redis.mget(
+            [self.entry_key(request_key)] + [self.generation_key(tag) for tag in tags]
+        )
+        payload, generations = values[0], dict(zip(tags, (int(value or 0) for value in values[1:])))
+        entry = CachedHttpResponse.from_json(payload) if payload else None
+        if entry is None or not self._is_current(entry, generations):
+            self.stats["misses"] += 1
+            return None, generations
+        self.stats["hits"] += 1
+        return entry, generations
+
+    async def set_async(
+        self, request_key: str, entry: CachedHttpResponse, generations: Dict[str, int], ttl_seconds: int
+    ) -> None:
+        """
+        Store a response under the generations read before it was rendered, so a response
+        rendered while its tags were invalidated is stored already stale and never served.
+        """
+        entry.generations = generations
+        if self.async_redis is None:
+            self._set_local(request_key, entry, ttl_seconds)
+            return
+
+        await self.async_redis.set(self.entry_key(request_key), entry.to_json(), ex=ttl_seconds)
+        self.stats["stores"] += 1
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Invalidate every response carrying one of the tags, called by the sync after writing."""
+        tags = list(tags)
+        if not tags:
+            return
+        self.stats["invalidations"] += len(tags)
+
+        if self.redis is None:
+            with self._lock:
+                for tag in tags:
+                    self._generations[tag] = self._generations.get(tag, 0) + 1
+            return
+
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            for tag in tags:
+                pipeline.incr(self.generation_key(tag))
+            pipeline.execute()
+        except redis.RedisError as e:
+            self.logger.error(f"Could not invalidate cached responses for {tags}: {e}")
+
+    def _lookup_local(
+        self, request_key: str, tags: List[str]
+    ) -> Tuple[Optional[CachedHttpResponse], Dict[str, int]]:
+        with self._lock:
+            item = self._entries.get(request_key)
+            generations = {tag: self._generations.get(tag, 0) for tag in tags}
+            if item is None or item[0] <= time.monotonic() or not self._is_current(item[1], generations):
+                self.stats["misses"] += 1
+                return None, generations
+            self._entries.move_to_end(request_key)
+            self.stats["hits"] += 1
+            return item[1], generations
+
+    def _set_local(self, request_key: str, entry: CachedHttpResponse, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[request_key] = (time.monotonic() + ttl_seconds, entry)
+            self._entries.move_to_end(request_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.stats["stores"] += 1
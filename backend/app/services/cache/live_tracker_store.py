@@ -0,0 +1,90 @@
+import logging
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List
+
+import redis
+
+from app.services.f1openapi.live_session_tracker import LiveSessionTracker
+
+# Only delete the poll lock if it is still the one we took
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class LiveTrackerStore:
+    """
+    Live session trackers kept in Redis, so whichever Celery worker process runs the next poll
+    continues from the same cursors and classification instead of its own copy.
+    A lock makes sure only one poll runs at a time.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        ttl_seconds: int = 6 * 3600,
+        lock_timeout_seconds: float = 120.0,
+        namespace: str = "live_tracker",
+    ):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self.namespace = namespace
+        self.logger = logging.getLogger(__name__)
+        self._release_lock = self.redis.register_script(RELEASE_LOCK_SCRIPT)
+
+    def key(self, session_key: int) -> str:
+        return f"{self.namespace}:{session_key}"
+
+    @property
+    def index_key(self) -> str:
+        return f"{self.namespace}:sessions"
+
+    @contextmanager
+    def lock(self) -> Iterator[bool]:
+        """Yield whether the poll lock was acquired, a concurrent poll holding it yields False."""
+        lock_key = f"{self.namespace}:lock"
+        token = uuid.uuid4().hex
+        acquired = bool(self.redis.set(lock_key, token, nx=True, px=int(self.lock_timeout_seconds * 1000)))
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self._release_lock(keys=[lock_key], args=[token])
+
+    def load(self, session_keys: List[int]) -> Dict[int, LiveSessionTracker]:
+        """Stored trackers of the given sessions, sessions polled for the first time are left out."""
+        if not session_keys:
+            return {}
+        payloads = self.redis.mget([self.key(session_key) for session_key in session_keys])
+        return {
+            session_key: LiveSessionTracker.from_json(payload)
+            for session_key, payload in zip(session_keys, payloads)
+            if payload
+        }
+
+    def save(self, trackers: Iterable[LiveSessionTracker]) -> None:
+        trackers = list(trackers)
+        if not trackers:
+            return
+        pipeline = self.redis.pipeline(transaction=False)
+        for tracker in trackers:
+            pipeline.set(self.key(tracker.session_key), tracker.to_json(), ex=self.ttl_seconds)
+        pipeline.sadd(self.index_key, *(tracker.session_key for tracker in trackers))
+        pipeline.execute()
+
+    def forget_except(self, session_keys: Iterable[int]) -> None:
+        """Drop the trackers of sessions that are no longer live."""
+        keep = {str(session_key) for session_key in session_keys}
+        stale = [session_key for session_key in self.redis.smembers(self.index_key) if session_key not in keep]
+        if not stale:
+            return
+        pipeline = self.redis.pipeline(transaction=False)
+        pipeline.delete(*(self.key(session_key) for session_key in stale))
+        pipeline.srem(self.index_key, *stale)
+        pipeline.execute()
+        self.logger.info(f"Forgot live trackers of sessions {stale}")
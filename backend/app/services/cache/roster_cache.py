@@ -0,0 +1,168 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.metrics import CACHE_INVALIDATIONS, CACHE_LOOKUPS, dependency_span
+from app.models.sql_models import RaceDriver
+
+# driver_number -> (race_driver_id, driver_name, team)
+Roster = Dict[int, Tuple[int, str, Optional[str]]]
+
+
+class RosterCache:
+    """
+    Cache of per-race driver rosters. Rosters don't change once a session's drivers are
+    synced, so they are kept in an in-process LRU with an optional shared Redis tier.
+    Empty rosters are never cached, the sync invalidates a race when it writes its drivers.
+    The sync runs in another process and can only invalidate Redis, so local entries expire
+    after local_ttl_seconds and a re-synced roster reaches every API process within that time.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        redis_client: Optional[redis.Redis] = None,
+        async_redis_client: Optional[aioredis.Redis] = None,
+        redis_ttl_seconds: int = 86400,
+        local_ttl_seconds: float = 60.0,
+    ):
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self.async_redis = async_redis_client
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds
+        self.logger = logging.getLogger(__name__)
+        self.stats = {"hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0}
+
+        self._rosters: "OrderedDict[int, Tuple[float, Roster]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(race_id: int) -> str:
+        return f"roster:{race_id}"
+
+    @staticmethod
+    def from_drivers(drivers: Iterable[RaceDriver]) -> Roster:
+        return {
+            driver.driver_number: (driver.race_driver_id, driver.driver_name, driver.team)
+            for driver in drivers
+        }
+
+    @staticmethod
+    def to_drivers(race_id: int, roster: Roster) -> List[RaceDriver]:
+        return [
+            RaceDriver(
+                race_driver_id=race_driver_id,
+                race_id=race_id,
+                driver_number=driver_number,
+                driver_name=driver_name,
+                team=team,
+            )
+            for driver_number, (race_driver_id, driver_name, team) in roster.items()
+        ]
+
+    @staticmethod
+    def _serialize(roster: Roster) -> str:
+        return json.dumps({str(number): list(entry) for number, entry in roster.items()})
+
+    @staticmethod
+    def _deserialize(payload: str) -> Roster:
+        return {int(number): tuple(entry) for number, entry in json.loads(payload).items()}
+
+    def _count(self, result: str) -> None:
+        with self._lock:
+            self.stats[result] += 1
+        CACHE_LOOKUPS.labels("roster", result).inc()
+
+    def _get_local(self, race_id: int) -> Optional[Roster]:
+        with self._lock:
+            entry = self._rosters.get(race_id)
+            if entry is None:
+                return None
+            expires_at, roster = entry
+            if expires_at <= time.monotonic():
+                del self._rosters[race_id]
+                return None
+            self._rosters.move_to_end(race_id)
+        self._count("hits")
+        return roster
+
+    def _put_local(self, race_id: int, roster: Roster) -> None:
+        with self._lock:
+            self._rosters[race_id] = (time.monotonic() + self.local_ttl_seconds, roster)
+            self._rosters.move_to_end(race_id)
+            while len(self._rosters) > self.max_entries:
+                self._rosters.popitem(last=False)
+
+    def _record_remote(self, race_id: int, payload: Optional[str]) -> Optional[Roster]:
+        if not payload:
+            self._count("misses")
+            return None
+        roster = self._deserialize(payload)
+        self._put_local(race_id, roster)
+        self._count("redis_hits")
+        return roster
+
+    def get(self, race_id: int) -> Optional[Roster]:
+        """Return the cached roster of a race, or None on a miss."""
+        roster = self._get_local(race_id)
+        if roster is not None:
+            return roster
+
+        payload = None
+        if self.redis is not None:
+            try:
+                payload = self.redis.get(self.key(race_id))
+            except redis.RedisError as e:
+                self.logger.error(f"Roster cache unavailable: {e}")
+        return self._record_remote(race_id, payload)
+
+    async def get_async(self, race_id: int) -> Optional[Roster]:
+        """Async variant of get, using the async Redis client."""
+        roster = self._get_local(race_id)
+        if roster is not None:
+            return roster
+
+        payload = None
+        if self.async_redis is not None:
+            try:
+                with dependency_span("redis", "roster_get"):
+                    payload = await self.async_redis.get(self.key(race_id))
+            except redis.RedisError as e:
+                self.logger.error(f"Roster cache unavailable: {e}")
+        return self._record_remote(race_id, payload)
+
+    async def put_async(self, race_id: int, roster: Roster) -> None:
+        """Cache a race's roster."""
+        if not roster:
+            return
+        self._put_local(race_id, roster)
+        if self.async_redis is not None:
+            try:
+                await self.async_redis.set(self.key(race_id), self._serialize(roster), ex=self.redis_ttl_seconds)
+            except redis.RedisError as e:
+                self.logger.error(f"Failed to store roster in cache: {e}")
+
+    def invalidate(self, race_ids: Iterable[int]) -> None:
+        """Drop the rosters of the given races from both tiers."""
+        race_ids = list(race_ids)
+        if not race_ids:
+            return
+
+        with self._lock:
+            for race_id in race_ids:
+                self._rosters.pop(race_id, None)
+            self.stats["invalidations"] += len(race_ids)
+        CACHE_INVALIDATIONS.labels("roster").inc(len(race_ids))
+
+        if self.redis is not None:
+            try:
+                self.redis.delete(*[self.key(race_id) for race_id in race_ids])
+            except redis.RedisError as e:
+                self.logger.error(f"Failed to invalidate roster cache: {e}")
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.metrics import dependency_span
+from app.models.pydantic_models import Standings
+
+# Only delete the rebuild lock if it is still the one we took
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class StandingsCache:
+    """
+    Read-through Redis cache of serialized Standings payloads, keyed by session_key.
+    A cold key is rebuilt by a single caller holding a short lock, the others wait
+    for the fresh value instead of all querying the database at once.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        async_redis_client: Optional[aioredis.Redis] = None,
+        ttl_seconds: int = 300,
+        lock_timeout_seconds: float = 5.0,
+        wait_timeout_seconds: float = 2.0,
+    ):
+        self.redis = redis_client
+        self.async_redis = async_redis_client
+        self.ttl_seconds = ttl_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self.logger = logging.getLogger(__name__)
+        self._release_lock_async = (
+            self.async_redis.register_script(RELEASE_LOCK_SCRIPT) if self.async_redis is not None else None
+        )
+
+    @staticmethod
+    def key(session_key: int) -> str:
+        return f"standings:{session_key}"
+
+    async def get_or_build_async(self, session_key: int, build: Callable[[], Awaitable[Standings]]) -> Standings:
+        """
+        Return the cached standings of a session, building and storing them on a miss.
+        Empty standings (no result yet) are returned uncached, like get_or_build_many_async does.
+        Falls back to building directly if Redis is unavailable.
+        """
+        if self.async_redis is None:
+            return await build()
+
+        key = self.key(session_key)
+        try:
+            with dependency_span("redis", "standings_get"):
+                cached = await self.async_redis.get(key)
+            if cached:
+                return Standings.model_validate_json(cached)
+
+            lock_key = f"{key}:lock"
+            token = uuid.uuid4().hex
+            if await self.async_redis.set(lock_key, token, nx=True, px=int(self.lock_timeout_seconds * 1000)):
+                try:
+                    standings = await build()
+                    if standings.standings:
+                        await self.store_async(standings)
+                    return standings
+                finally:
+                    await self._release_lock_async(keys=[lock_key], args=[token])
+
+            # Someone else is rebuilding this key, wait for their result. A released lock without
+            # a value means they built empty standings, which aren't cached, so build them here.
+            deadline = time.monotonic() + self.wait_timeout_seconds
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                cached = await self.async_redis.get(key)
+                if cached:
+                    return Standings.model_validate_json(cached)
+                if not await self.async_redis.exists(lock_key):
+                    break
+        except redis.RedisError as e:
+            self.logger.error(f"Standings cache unavailable: {e}")
+
+        return await build()
+
+    async def get_or_build_many_async(
+        self,
+        session_keys: List[int],
+        build: Callable[[List[int]], Awaitable[List[Standings]]],
+    ) -> Dict[int, Standings]:
+        """
+        Batch variant of get_or_build_async: one MGET for all sessions, then a single build of the
+        missing ones, stored with one pipeline. Skips the rebuild lock, a concurrent rebuild of the
+        same session only costs a duplicate write.
+        """
+        cached: Dict[int, Standings] = {}
+        if self.async_redis is not None and session_keys:
+            try:
+                with dependency_span("redis", "standings_mget"):
+                    payloads = await self.async_redis.mget([self.key(session_key) for session_key in session_keys])
+                cached = {
+                    session_key: Standings.model_validate_json(payload)
+                    for session_key, payload in zip(session_keys, payloads)
+                    if payload
+                }
+            except redis.RedisError as e:
+                self.logger.error(f"Standings cache unavailable: {e}")
+
+        missing = [session_key for session_key in session_keys if session_key not in cached]
+        if not missing:
+            return cached
+
+        built = await build(missing)
+        if self.async_redis is not None and built:
+            try:
+                pipeline = self.async_redis.pipeline(transaction=False)
+                for standings in built:
+                    pipeline.set(self.key(standings.session_key), standings.model_dump_json(), ex=self.ttl_seconds)
+                await pipeline.execute()
+            except redis.RedisError as e:
+                self.logger.error(f"Failed to store standings in cache: {e}")
+
+        cached.update({standings.session_key: standings for standings in built})
+        return cached
+
+    async def store_async(self, standings: Standings) -> None:
+        """Write a standings snapshot to the cache."""
+        try:
+            await self.async_redis.set(
+                self.key(standings.session_key), standings.model_dump_json(), ex=self.ttl_seconds
+            )
+        except redis.RedisError as e:
+            self.logger.error(f"Failed to store standings in cache: {e}")
+
+    def invalidate(self, session_keys: Iterable[int]) -> None:
+        """Drop the cached standings of the given sessions, e.g. after their results changed."""
+        keys = [self.key(session_key) for session_key in session_keys]
+        if not keys:
+            return
+        try:
+            self.redis.delete(*keys)
+        except redis.RedisError as e:
+            self.logger.error(f"Failed to invalidate standings cache: {e}")
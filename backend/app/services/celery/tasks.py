@@ -1,17 +1,19 @@
+import json
 import logging
 from datetime import datetime
-from app.services.database.database_service import DatabaseService
-from app.services.f1openapi.f1_api_service import F1API
+from app.core.container import get_container
+from app.core.metrics import dependency_span
+from app.services.database.connector import get_db_manager
 from app.services.celery.celery_config import celery_app
-import redis
+from app.services.sse.session_update_hub import publish_session_update
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create service instances (these could be injected via DI container in the future)
-f1_api = F1API()
-db_service = DatabaseService(f1_api)
-r = redis.Redis(host='localhost', port=6379, decode_responses=True)
+# Share the same pooled F1 API client as the rest of the process
+f1_api = get_container().get_f1_api()
+db_service = get_container().get_database_service()
+r = get_container().get_redis()
 
 @celery_app.task
 def update_database():
@@ -25,11 +27,15 @@ def update_database():
         # Sync data for current year
         result = db_service.sync_year_data(current_year)
         
+        connection_stats = f1_api.get_connection_stats()
         logger.info(f"Database update completed successfully: {result}")
+        logger.info(f"F1 API connection stats: {connection_stats}")
+        logger.info(f"F1 API cache stats: {f1_api.get_cache_stats()}")
         return {
             "status": "success",
             "year": current_year,
-            "result": result.__dict__
+            "result": result.__dict__,
+            "f1_api_connections": connection_stats,
         }
         
     except Exception as e:
@@ -41,6 +47,22 @@ def update_database():
         
 @celery_app.task
 def update_session_result():
-    # TODO this is not the actual implementation but just a test for sse
-    logger.info("Starting session result update task...")
-    r.publish("session_updates", "Session result updated")
\ No newline at end of file
+    """Polls live sessions and publishes the changed standings on the session_updates stream."""
+    try:
+        with get_db_manager().get_session_context() as session:
+            updates = db_service.update_latest_session_results(session)
+    except Exception as e:
+        logger.error(f"Session result update failed: {e}")
+        return {
+            "status": "error",
+            "error": str(e)
+        }
+
+    for update in updates:
+        with dependency_span("redis", "publish"):
+            publish_session_update(r, json.dumps(update))
+
+    return {
+        "status": "success",
+        "updates": len(updates)
+    }
@@ -1,56 +1,104 @@
 from sqlalchemy import create_engine, text
-from sqlmodel import SQLModel, Session
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
-from contextlib import contextmanager
-from sqlalchemy.pool import QueuePool
+from app.services.database.schema_migrations import check_schema_version
+from app.services.database.pool_metrics import instrument_engine, instrumented_pool_class
+from contextlib import asynccontextmanager, contextmanager
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
 
 class DatabaseManager:
-    def __init__(self):
+    def __init__(
+        self,
+        replica_urls: Optional[List[str]] = None,
+        replica_max_lag_seconds: Optional[float] = None,
+        replica_check_interval: Optional[float] = None,
+    ):
         self._db_name = settings.database_name
         self._host = settings.host_name
         self._engine = None
         self._session_factory = None
-        
-        self._initialize_database()
+        self._async_engine: AsyncEngine = None
+        self._async_session_factory = None
 
-    def _initialize_database(self):
-        """Initialize database and create tables if needed."""
-        # First, create database if it doesn't exist
-        temp_engine = create_engine(
-            f"mysql+mysqlconnector://{settings.mysql_user}:{settings.mysql_password}@{self._host}/",
-            echo=False
+        # Read-only sessions go to a replica within the staleness tolerance, otherwise to the primary
+        self._replica_urls = list(settings.database_replica_urls if replica_urls is None else replica_urls)
+        self._replica_max_lag_seconds = (
+            settings.replica_max_lag_seconds if replica_max_lag_seconds is None else replica_max_lag_seconds
         )
-
-        with temp_engine.connect() as connection:
-            try:
-                connection.execute(text(f"CREATE DATABASE IF NOT EXISTS {self._db_name}"))
-                connection.commit()
-                print(f"Database '{self._db_name}' ready.")
-            except SQLAlchemyError as e:
-                print(f"Error creating database: {e}")
-                raise
+        self._replica_check_interval = (
+            settings.replica_check_interval if replica_check_interval is None else replica_check_interval
+        )
+        self._replica_engines: List[AsyncEngine] = []
+        self._replica_session_factories: List[async_sessionmaker] = []
+        # Replica index -> (checked_at monotonic time, usable)
+        self._replica_health: Dict[int, Tuple[float, bool]] = {}
+        self._next_replica = 0
         
-        temp_engine.dispose()
+        self._initialize_database()
+
+    @staticmethod
+    def _pool_options() -> Dict:
+        return {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_pre_ping": settings.db_pool_pre_ping,
+        }
 
+    def _initialize_database(self):
+        """Create the engines and check the schema version, the schema itself is managed by migrations."""
         # Create main engine with connection pooling
         self._engine = create_engine(
             f"mysql+mysqlconnector://{settings.mysql_user}:{settings.mysql_password}@{self._host}/{self._db_name}",
-            poolclass=QueuePool,
-            pool_size=10,
-            max_overflow=20,
-            pool_pre_ping=True,
-            pool_recycle=3600,
+            poolclass=instrumented_pool_class(QueuePool, "primary"),
+            **self._pool_options(),
             echo=False
         )
+        instrument_engine(self._engine, "primary", settings.db_slow_query_ms)
 
         # Create session factory
         from sqlalchemy.orm import sessionmaker
         self._session_factory = sessionmaker(bind=self._engine)
 
-        # Create tables
-        SQLModel.metadata.create_all(self._engine)
+        # Async engine for the FastAPI routes, so queries don't block the event loop
+        self._async_engine = create_async_engine(
+            f"mysql+aiomysql://{settings.mysql_user}:{settings.mysql_password}@{self._host}/{self._db_name}",
+            poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, "primary_async"),
+            **self._pool_options(),
+            echo=False
+        )
+        instrument_engine(self._async_engine.sync_engine, "primary_async", settings.db_slow_query_ms)
+        self._async_session_factory = async_sessionmaker(
+            bind=self._async_engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+        for index, url in enumerate(self._replica_urls):
+            engine = create_async_engine(
+                url,
+                poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, f"replica_{index}"),
+                **self._pool_options(),
+                echo=False
+            )
+            instrument_engine(engine.sync_engine, f"replica_{index}", settings.db_slow_query_ms)
+            self._replica_engines.append(engine)
+            self._replica_session_factories.append(
+                async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+            )
+
+        # Only read the schema version here, DDL runs once per deploy via `python -m app.services.migrate`
+        if settings.db_schema_check:
+            check_schema_version(self._engine)
 
     def get_session(self) -> Session:
         """Get a new database session."""
@@ -70,6 +118,91 @@ class DatabaseManager:
         finally:
             session.close()
 
+    @asynccontextmanager
+    async def get_async_session_context(self) -> AsyncIterator[AsyncSession]:
+        """Async context manager for database sessions with automatic cleanup."""
+        if not self._async_session_factory:
+            raise RuntimeError("Database not initialized")
+        session = self._async_session_factory()
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def _replica_lag(self, index: int) -> Optional[float]:
+        """Seconds the replica is behind its source, None when replication is not running."""
+        async with self._replica_engines[index].connect() as connection:
+            status = (await connection.execute(text("SHOW REPLICA STATUS"))).mappings().first()
+        if status is None or status["Seconds_Behind_Source"] is None:
+            return None
+        return float(status["Seconds_Behind_Source"])
+
+    async def _is_replica_usable(self, index: int) -> bool:
+        checked_at, usable = self._replica_health.get(index, (None, False))
+        now = time.monotonic()
+        if checked_at is not None and now - checked_at < self._replica_check_interval:
+            return usable
+
+        # Record the check time first so concurrent requests don't all probe the same replica
+        self._replica_health[index] = (now, usable)
+        try:
+            lag = await self._replica_lag(index)
+            usable = lag is not None and lag <= self._replica_max_lag_seconds
+            if not usable:
+                logger.warning(f"Replica {index} is not usable for reads, lag: {lag}")
+        except SQLAlchemyError as e:
+            usable = False
+            logger.warning(f"Replica {index} health check failed: {e}")
+        self._replica_health[index] = (now, usable)
+        return usable
+
+    async def _get_read_session_factory(self) -> async_sessionmaker:
+        """Round-robin over the usable replicas, falling back to the primary."""
+        count = len(self._replica_session_factories)
+        for offset in range(count):
+            index = (self._next_replica + offset) % count
+            if await self._is_replica_usable(index):
+                self._next_replica = (index + 1) % count
+                return self._replica_session_factories[index]
+        return self._async_session_factory
+
+    @asynccontextmanager
+    async def get_async_read_session_context(self) -> AsyncIterator[AsyncSession]:
+        """
+        Async context manager for read-only sessions, served by a replica when one is within
+        the staleness tolerance. Never write through these sessions.
+        """
+        if not self._async_session_factory:
+            raise RuntimeError("Database not initialized")
+        session_factory = await self._get_read_session_factory()
+        session = session_factory()
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    def get_replica_status(self) -> Dict[int, bool]:
+        """Last known usability of each replica."""
+        return {index: usable for index, (_, usable) in self._replica_health.items()}
+
+    async def close_async(self):
+        """Dispose the async engines and their connections."""
+        if self._async_engine:
+            await self._async_engine.dispose()
+            self._async_engine = None
+            self._async_session_factory = None
+        for engine in self._replica_engines:
+            await engine.dispose()
+        self._replica_engines = []
+        self._replica_session_factories = []
+        self._replica_health = {}
+
     def close(self):
         """Close all connections and dispose engine."""
         if self._engine:
@@ -1,14 +1,24 @@
 import logging
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
 from dataclasses import dataclass, field
 
 from sqlmodel import Session
 from app.services.f1openapi.f1_api_service import F1API
+from app.services.f1openapi.live_session_tracker import LiveSessionTracker
 from sqlalchemy.exc import SQLAlchemyError
 from app.services.database.race_service import RaceService
 from app.services.database.race_driver_service import RaceDriverService
 from app.services.database.race_result_service import RaceResultService
+from app.services.database.sync_state_service import SyncStateService
+from app.services.database.leaderboard_service import LeaderboardService
 from app.services.database.connector import get_db_manager
+from app.services.cache.standings_cache import StandingsCache
+from app.services.cache.roster_cache import RosterCache
+from app.services.cache.live_tracker_store import LiveTrackerStore
+from app.services.cache.http_response_cache import HttpResponseCache, SESSIONS_TAG, race_tag
+from app.core.config import settings
 
 logging.basicConfig(level=logging.INFO)
 
@@ -18,23 +28,84 @@ class SyncResult:
     added_sessions: int = 0
     added_drivers: int = 0
     added_results: int = 0
+    rows_written: int = 0
     errors: List[str] = field(default_factory=list)
 
 class DatabaseService:
     """Service for synchronizing F1 data between API and database."""
     
-    def __init__(self, f1_api: Optional[F1API] = None):
+    def __init__(
+        self,
+        f1_api: Optional[F1API] = None,
+        max_workers: Optional[int] = None,
+        standings_cache: Optional[StandingsCache] = None,
+        roster_cache: Optional[RosterCache] = None,
+        http_response_cache: Optional[HttpResponseCache] = None,
+        live_tracker_store: Optional[LiveTrackerStore] = None,
+    ):
         self.f1_api = f1_api or F1API()
+        self.standings_cache = standings_cache
+        self.http_response_cache = http_response_cache
+        self.max_workers = max_workers or settings.f1_sync_max_workers
+        self.batch_size = settings.sync_batch_size
         self.race_service = RaceService()
-        self.driver_service = RaceDriverService()
+        self.driver_service = RaceDriverService(roster_cache)
         self.result_service = RaceResultService()
+        self.sync_state_service = SyncStateService()
+        self.leaderboard_service = LeaderboardService()
         self.valid_sessions = ["Qualifying", "Race"]
         self.logger = logging.getLogger(__name__)
+        # Running classifications of live sessions, kept between polls in Redis when a store is given,
+        # otherwise in this process only, which is only correct with a single worker process
+        self.live_tracker_store = live_tracker_store
+        self.live_trackers: Dict[int, LiveSessionTracker] = {}
 
     def set_valid_sessions(self, valid_sessions_list: List[str]) -> None:
         """Set which session types to sync."""
         self.valid_sessions = valid_sessions_list
 
+    def _fetch_concurrently(self, fetch: Callable[[Any], Any], keys: Iterable[Any]) -> Dict[Any, Any]:
+        """
+        Call the F1 API for every key using a bounded worker pool.
+        Only the API requests run in worker threads, database writes stay on the caller's thread.
+        Args:
+            fetch: F1 API method taking a single key
+            keys: Keys to fetch
+        Returns:
+            Mapping of key to API response
+        """
+        keys = list(keys)
+        if self.max_workers <= 1 or len(keys) <= 1:
+            return {key: fetch(key) for key in keys}
+
+        workers = min(self.max_workers, len(keys))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="f1-sync") as executor:
+            return dict(zip(keys, executor.map(fetch, keys)))
+
+    def _invalidate_standings(self, race_results: List[Dict]) -> None:
+        """Drop cached standings and winners of sessions whose results were just written."""
+        if self.standings_cache is not None:
+            self.standings_cache.invalidate(race_result["race_id"] for race_result in race_results)
+        # /results/winners depends on the results too
+        self._invalidate_responses(race_tag(race_result["race_id"]) for race_result in race_results)
+
+    def _invalidate_responses(self, tags: Iterable[str]) -> None:
+        """Drop cached API responses carrying one of the tags."""
+        if self.http_response_cache is not None:
+            self.http_response_cache.invalidate(tags)
+
+    @staticmethod
+    def _utcnow() -> datetime:
+        """Current UTC time as a naive datetime, matching the DATETIME columns."""
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+    @staticmethod
+    def _parse_api_date(value: Optional[str]) -> Optional[datetime]:
+        """Parse an F1 open API ISO timestamp into a naive UTC datetime."""
+        if not value:
+            return None
+        return datetime.fromisoformat(value).astimezone(timezone.utc).replace(tzinfo=None)
+
     def sync_year_data(self, year: str) -> SyncResult:
         """Sync all data for a given year."""
         result = SyncResult()
@@ -52,7 +123,8 @@ class DatabaseService:
                 # Sync results
                 results_result = self.add_missing_session_results(session)
                 result.added_results = results_result
-                
+
+                result.rows_written = result.added_sessions + result.added_drivers + result.added_results
                 self.logger.info(f"Sync completed: {result}")
                 return result
                 
@@ -64,6 +136,7 @@ class DatabaseService:
     def add_missing_sessions_in_year(self, session: Session, year: str) -> int:
         """
         Adds missing sessions in a year to the database.
+        Sessions are compared against the sync state instead of the whole races table.
         Args:
             session: The database session
             year: The year for which to add missing sessions
@@ -72,44 +145,65 @@ class DatabaseService:
         """
         added_count = 0
         try:
-            sessions_database = self.race_service.get_all_races(session)
-            sessions_f1_api = self.f1_api.get_sessions(year)
+            sessions_f1_api = self.f1_api.get_sessions(year) or []
 
-            session_keys_in_database = {session_obj.race_id for session_obj in sessions_database}
             session_keys_in_f1_api = {
                 session_data["session_key"]
                 for session_data in sessions_f1_api
                 if session_data["session_type"] in self.valid_sessions
             }
+            session_keys_in_database = self.sync_state_service.get_known_race_ids(
+                session, session_keys_in_f1_api
+            )
 
             missing_keys = session_keys_in_f1_api - session_keys_in_database
             if not missing_keys:
                 self.logger.info("No missing sessions found.")
                 return added_count
 
-            missing_sessions = [
-                self.f1_api.get_session_by_id(missing_key) for missing_key in missing_keys
-            ]
+            missing_sessions = self._fetch_concurrently(self.f1_api.get_session_by_id, missing_keys)
 
             # Filter again in case API returns unexpected types
             valid_sessions = [
-                s 
-                for session_list in missing_sessions
-                for s in session_list
+                s
+                for session_list in missing_sessions.values()
+                for s in session_list or []
                 if s["session_type"] in self.valid_sessions
             ]
 
             # Batch insert
-            for session_data in valid_sessions:
-                self.race_service.add_race(
-                    session,
-                    session_data["country_name"],
-                    session_data["session_name"],
-                    session_data["date_start"],
-                    session_data["session_key"],
-                )
-                added_count += 1
-                self.logger.info(f"Added missing session with ID: {session_data['session_key']}")
+            races = [
+                {
+                    "race_id": session_data["session_key"],
+                    "race_name": session_data["country_name"],
+                    "race_type": session_data["session_name"],
+                    "race_date": self._parse_api_date(session_data["date_start"]),
+                }
+                for session_data in valid_sessions
+            ]
+            added_count = self.race_service.add_races(session, races, self.batch_size)
+            if races:
+                self._invalidate_responses([SESSIONS_TAG])
+            self.logger.info(f"Added missing sessions with IDs: {[race['race_id'] for race in races]}")
+
+            # Races synced before the sync state existed may already have drivers and results
+            race_ids = [race["race_id"] for race in races]
+            with_drivers = self.driver_service.get_race_ids_with_drivers(session, race_ids)
+            with_results = self.result_service.get_race_ids_with_results(session, race_ids)
+
+            now = self._utcnow()
+            sync_states = [
+                {
+                    "race_id": session_data["session_key"],
+                    "session_start": self._parse_api_date(session_data.get("date_start")),
+                    "session_end": self._parse_api_date(session_data.get("date_end")),
+                    "drivers_synced": session_data["session_key"] in with_drivers,
+                    "results_synced": session_data["session_key"] in with_results,
+                    "last_synced_at": now,
+                }
+                for session_data in valid_sessions
+            ]
+            self.sync_state_service.add_sessions(session, sync_states, self.batch_size)
 
             self.logger.info(f"Added {added_count} missing sessions.")
             return added_count
@@ -125,6 +219,7 @@ class DatabaseService:
     def add_missing_session_drivers(self, session: Session) -> int:
         """
         Adds missing session drivers to the database.
+        Only sessions whose sync state has no drivers yet are fetched.
         Args:
             session: The database session
         Returns:
@@ -132,25 +227,29 @@ class DatabaseService:
         """
         added_count = 0
         try:
-            all_f1_sessions = self.race_service.get_all_races(session)
-            all_f1_session_drivers = self.driver_service.get_all_session_drivers(session)
-            
-            # Compare which sessions have no drivers in db
-            session_keys_without_drivers = set([race.race_id for race in all_f1_sessions]) - set([driver.race_id for driver in all_f1_session_drivers])
-            
-            for missing_session_key in session_keys_without_drivers:
-                drivers = self.f1_api.get_session_drivers(missing_session_key)
-                for driver in drivers:
-                    self.driver_service.add_session_driver(
-                        session,
-                        missing_session_key,
-                        driver["full_name"],
-                        driver["driver_number"],
-                        driver["country_code"],
-                        driver["team_name"],
-                    )
-                    added_count += 1
-                    
+            session_keys_without_drivers = self.sync_state_service.get_pending_driver_race_ids(session)
+
+            drivers_by_session = self._fetch_concurrently(
+                self.f1_api.get_session_drivers, session_keys_without_drivers
+            )
+            session_drivers = [
+                {
+                    "race_id": missing_session_key,
+                    "driver_number": driver["driver_number"],
+                    "driver_name": driver["full_name"],
+                    "team": driver["team_name"],
+                }
+                for missing_session_key, drivers in drivers_by_session.items()
+                for driver in drivers or []
+            ]
+            added_count = self.driver_service.add_session_drivers(session, session_drivers, self.batch_size)
+            self.driver_service.invalidate_rosters({driver["race_id"] for driver in session_drivers})
+            self._invalidate_responses({race_tag(driver["race_id"]) for driver in session_drivers})
+
+            # Sessions without drivers yet stay pending for the next run
+            synced_keys = [key for key, drivers in drivers_by_session.items() if drivers]
+            self.sync_state_service.mark_synced(session, synced_keys, self._utcnow(), drivers_synced=True)
+
             self.logger.info(f"Added {added_count} missing drivers.")
             return added_count
             
@@ -165,6 +264,8 @@ class DatabaseService:
     def add_missing_session_results(self, session: Session) -> int:
         """
         Adds missing session results to the database.
+        Sessions that started but are not finished yet are refreshed on every run,
+        finished sessions are marked complete and never fetched again.
         Args:
             session: The database session
         Returns:
@@ -172,31 +273,45 @@ class DatabaseService:
         """
         added_count = 0
         try:
-            all_f1_sessions = self.race_service.get_all_races(session)
-            all_f1_session_results = self.result_service.get_all_session_results(session)
-            
-            # Compare which sessions have no results in db
-            session_keys_without_results = set([race.race_id for race in all_f1_sessions]) - set([result.race_id for result in all_f1_session_results])
-            
+            now = self._utcnow()
+            session_keys_without_results = self.sync_state_service.get_pending_result_race_ids(session, now)
+
             self.logger.info(f"Session keys without results: {session_keys_without_results}")
             
-            for session_key in session_keys_without_results:
-                driver_numbers_in_top = []
-                for i in range(1, 4):
-                    driver_numbers_in_top.append(
-                        self.f1_api.get_driver_at_position_in_session(session_key, i)
-                    )
-                    
+            classifications = self._fetch_concurrently(
+                self.f1_api.get_session_classification, session_keys_without_results
+            )
+            race_results = []
+            for session_key, classification in classifications.items():
+                if not classification or len(classification) < 3:
+                    self.logger.warning(f"Incomplete classification for session {session_key}, skipping")
+                    continue
+
+                driver_numbers_in_top = classification[:3]
                 self.logger.debug(f"Top 3 drivers for session {session_key}: {driver_numbers_in_top}")
-                
-                self.result_service.add_race_result(
-                    session,
-                    session_key,
-                    driver_numbers_in_top[0]["driver_number"],
-                    driver_numbers_in_top[1]["driver_number"],
-                    driver_numbers_in_top[2]["driver_number"],
+
+                race_results.append(
+                    {
+                        "race_id": session_key,
+                        "position_1_driver_id": driver_numbers_in_top[0]["driver_number"],
+                        "position_2_driver_id": driver_numbers_in_top[1]["driver_number"],
+                        "position_3_driver_id": driver_numbers_in_top[2]["driver_number"],
+                    }
                 )
-                added_count += 1
+
+            added_count = self.result_service.add_race_results(session, race_results, self.batch_size)
+            self._invalidate_standings(race_results)
+
+            # Results are only final once the session ended, in-progress sessions stay pending
+            finished_keys = self.sync_state_service.get_finished_race_ids(
+                session,
+                [race_result["race_id"] for race_result in race_results],
+                now - timedelta(seconds=settings.f1_cache_finished_grace),
+            )
+            self.sync_state_service.mark_synced(session, finished_keys, now, results_synced=True)
+
+            # Final results land in the leaderboard once
+            self.leaderboard_service.score_races(session, list(finished_keys))
 
             self.logger.info(f"Added {added_count} missing results.")
             return added_count
@@ -209,15 +324,88 @@ class DatabaseService:
             self.logger.error(f"Error: {e}")
             raise
 
-    def update_latest_session_results(self, session: Session) -> int:
+    def _load_live_trackers(self, live_keys: List[int]) -> Dict[int, LiveSessionTracker]:
+        """Trackers of the live sessions, forgetting the sessions that are no longer live."""
+        if self.live_tracker_store is None:
+            for session_key in set(self.live_trackers) - set(live_keys):
+                del self.live_trackers[session_key]
+            return {
+                session_key: self.live_trackers.setdefault(session_key, LiveSessionTracker(session_key))
+                for session_key in live_keys
+            }
+
+        self.live_tracker_store.forget_except(live_keys)
+        stored = self.live_tracker_store.load(live_keys)
+        return {session_key: stored.get(session_key) or LiveSessionTracker(session_key) for session_key in live_keys}
+
+    def update_latest_session_results(self, session: Session) -> List[Dict[str, Any]]:
         """
-        Updates the latest session results.
+        Polls position and interval data of every live session, only fetching rows newer
+        than the last poll, and stores the top 3 whenever it changes.
+        Nothing is requested from the F1 API when no session is live.
         Args:
             session: The database session
         Returns:
-            Number of results updated
+            One update per live session that changed, containing only the changed drivers
+        Raises:
+            SQLAlchemyError: If the live sessions can't be read, the trackers are left untouched
         """
-        # TODO: Implement periodic update logic
-        self.logger.info("Update latest session results - not yet implemented")
-        return 0
-    
\ No newline at end of file
+        if self.live_tracker_store is None:
+            return self._poll_live_sessions(session)
+
+        with self.live_tracker_store.lock() as acquired:
+            if not acquired:
+                self.logger.info("Live sessions are being polled by another worker, skipping")
+                return []
+            return self._poll_live_sessions(session)
+
+    def _poll_live_sessions(self, session: Session) -> List[Dict[str, Any]]:
+        now = self._utcnow()
+        ended_after = now - timedelta(seconds=settings.live_session_end_margin)
+        live_keys = self.sync_state_service.get_live_race_ids(session, now, ended_after)
+        trackers = self._load_live_trackers(live_keys)
+
+        if not live_keys:
+            self.logger.debug("No live session, skipping live update")
+            return []
+
+        updates = []
+        race_results = []
+        for session_key, tracker in trackers.items():
+            previous_top = tracker.top()
+
+            changed_positions = tracker.apply_positions(
+                self.f1_api.get_positions_since(session_key, tracker.position_cursor)
+            )
+            changed_intervals = tracker.apply_intervals(
+                self.f1_api.get_intervals_since(session_key, tracker.interval_cursor)
+            )
+
+            top = tracker.top()
+            if len(top) == 3 and top != previous_top:
+                race_results.append(
+                    {
+                        "race_id": session_key,
+                        "position_1_driver_id": top[0],
+                        "position_2_driver_id": top[1],
+                        "position_3_driver_id": top[2],
+                    }
+                )
+
+            if changed_positions or changed_intervals:
+                updates.append(
+                    {
+                        "session_key": session_key,
+                        "positions": changed_positions,
+                        "intervals": changed_intervals,
+                    }
+                )
+
+        self.result_service.add_race_results(session, race_results, self.batch_size)
+        self._invalidate_standings(race_results)
+        # Only advance the shared cursors once the new standings are stored
+        if self.live_tracker_store is not None:
+            self.live_tracker_store.save(trackers.values())
+
+        self.logger.info(f"Live update: {len(updates)} sessions changed, {len(race_results)} standings stored")
+        return updates
@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.config import settings
+from app.models.sql_models import Guess, GuessScore, LeaderboardEntry, Race, RaceResult, User
+from app.models.pydantic_models import LeaderboardPage, LeaderboardRow
+import logging
+
+
+@dataclass
+class PointsScheme:
+    """Points awarded for a top 3 guess."""
+    exact_position: int = 3
+    podium_position: int = 1
+    perfect_podium_bonus: int = 2
+
+    @classmethod
+    def from_settings(cls) -> "PointsScheme":
+        return cls(
+            exact_position=settings.score_exact_position,
+            podium_position=settings.score_podium_position,
+            perfect_podium_bonus=settings.score_perfect_podium_bonus,
+        )
+
+    def score(self, guessed: Tuple[int, int, int], actual: Tuple[int, int, int]) -> Tuple[int, int, int]:
+        """
+        Score a guess against the actual top 3.
+        Returns:
+            Points, number of exact positions and number of podium drivers in the wrong slot
+        """
+        exact = sum(1 for guess, result in zip(guessed, actual) if guess == result)
+        # Each podium driver counts once, a pick repeated across slots can't collect the same driver again
+        podium = len(set(guessed) & set(actual)) - exact
+        points = exact * self.exact_position + podium * self.podium_position
+        if exact == 3:
+            points += self.perfect_podium_bonus
+        return points, exact, podium
+
+
+class LeaderboardService:
+    """
+    Service for scoring guesses and maintaining the per-season leaderboard.
+    """
+
+    def __init__(self, points_scheme: Optional[PointsScheme] = None):
+        self.points_scheme = points_scheme or PointsScheme.from_settings()
+        self.logger = logging.getLogger(__name__)
+
+    def score_races(self, session: Session, race_ids: List[int]) -> int:
+        """
+        Score every guess of the given races and apply the difference to the leaderboard.
+        Re-scoring a race only moves the totals by what changed, so it is safe to call
+        again when a result is corrected.
+        Args:
+            session: The database session
+            race_ids: Races with a final result
+        Returns:
+            Number of guesses scored
+        """
+        if not race_ids:
+            return 0
+
+        try:
+            query = (
+                select(Guess, RaceResult, Race.race_date)
+                .join(RaceResult, RaceResult.race_id == Guess.race_id)
+                .join(Race, Race.race_id == Guess.race_id)
+                .where(Guess.race_id.in_(race_ids))
+            )
+            rows = session.exec(query).all()
+            if not rows:
+                return 0
+
+            previous_scores = {
+                score.guess_id: score
+                for score in session.exec(select(GuessScore).where(GuessScore.race_id.in_(race_ids))).all()
+            }
+
+            new_scores = []
+            deltas: Dict[Tuple[int, int], Dict[str, int]] = {}
+            for guess, result, race_date in rows:
+                season = race_date.year
+                user_id = int(guess.user_id)
+                points, exact, podium = self.points_scheme.score(
+                    (guess.position_1_driver_id, guess.position_2_driver_id, guess.position_3_driver_id),
+                    (result.position_1_driver_id, result.position_2_driver_id, result.position_3_driver_id),
+                )
+                new_scores.append(
+                    {
+                        "guess_id": guess.guess_id,
+                        "race_id": guess.race_id,
+                        "user_id": user_id,
+                        "season": season,
+                        "points": points,
+                        "exact_positions": exact,
+                        "podium_positions": podium,
+                    }
+                )
+
+                previous = previous_scores.get(guess.guess_id)
+                delta = deltas.setdefault(
+                    (season, user_id),
+                    {"points": 0, "exact_positions": 0, "podium_positions": 0, "races_scored": 0},
+                )
+                delta["points"] += points - (previous.points if previous else 0)
+                delta["exact_positions"] += exact - (previous.exact_positions if previous else 0)
+                delta["podium_positions"] += podium - (previous.podium_positions if previous else 0)
+                delta["races_scored"] += 0 if previous else 1
+
+            statement = insert(GuessScore).values(new_scores)
+            session.exec(
+                statement.on_duplicate_key_update(
+                    points=statement.inserted.points,
+                    exact_positions=statement.inserted.exact_positions,
+                    podium_positions=statement.inserted.podium_positions,
+                )
+            )
+
+            leaderboard_rows = [
+                {"season": season, "user_id": user_id, **delta}
+                for (season, user_id), delta in deltas.items()
+                if any(delta.values())
+            ]
+            if leaderboard_rows:
+                statement = insert(LeaderboardEntry).values(leaderboard_rows)
+                session.exec(
+                    statement.on_duplicate_key_update(
+                        points=LeaderboardEntry.points + statement.inserted.points,
+                        exact_positions=LeaderboardEntry.exact_positions + statement.inserted.exact_positions,
+                        podium_positions=LeaderboardEntry.podium_positions + statement.inserted.podium_positions,
+                        races_scored=LeaderboardEntry.races_scored + statement.inserted.races_scored,
+                    )
+                )
+
+            session.commit()
+            self.logger.info(f"Scored {len(new_scores)} guesses for races {race_ids}")
+            return len(new_scores)
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error scoring races: {e}")
+            raise
+
+    @staticmethod
+    def _leaderboard_queries(season: int, offset: int, page_size: int):
+        count_query = select(func.count()).select_from(LeaderboardEntry).where(LeaderboardEntry.season == season)
+        page_query = (
+            select(LeaderboardEntry, User.username)
+            .join(User, User.user_id == LeaderboardEntry.user_id)
+            .where(LeaderboardEntry.season == season)
+            .order_by(LeaderboardEntry.points.desc(), LeaderboardEntry.user_id)
+            .offset(offset)
+            .limit(page_size)
+        )
+        return count_query, page_query
+
+    @staticmethod
+    def _leaderboard_page(season: int, page: int, page_size: int, total: int, rows) -> LeaderboardPage:
+        offset = (page - 1) * page_size
+        entries = [
+            LeaderboardRow(
+                rank=offset + position + 1,
+                user_id=entry.user_id,
+                username=username,
+                points=entry.points,
+                exact_positions=entry.exact_positions,
+                podium_positions=entry.podium_positions,
+                races_scored=entry.races_scored,
+            )
+            for position, (entry, username) in enumerate(rows)
+        ]
+        return LeaderboardPage(season=season, page=page, page_size=page_size, total=total, entries=entries)
+
+    def get_leaderboard(self, session: Session, season: int, page: int = 1, page_size: int = 50) -> LeaderboardPage:
+        """Read one page of the materialized leaderboard of a season."""
+        try:
+            count_query, page_query = self._leaderboard_queries(season, (page - 1) * page_size, page_size)
+            total = session.exec(count_query).one()
+            rows = session.exec(page_query).all()
+            return self._leaderboard_page(season, page, page_size, total, rows)
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error fetching leaderboard: {e}")
+            raise
+
+    async def get_leaderboard_async(
+        self, session: AsyncSession, season: int, page: int = 1, page_size: int = 50
+    ) -> LeaderboardPage:
+        """Async variant of get_leaderboard for the API routes."""
+        try:
+            count_query, page_query = self._leaderboard_queries(season, (page - 1) * page_size, page_size)
+            total = (await session.exec(count_query)).one()
+            rows = (await session.exec(page_query)).all()
+            return self._leaderboard_page(season, page, page_size, total, rows)
+        except SQLAlchemyError as e:
+            await session.rollback()
+            self.logger.error(f"Error fetching leaderboard: {e}")
+            raise
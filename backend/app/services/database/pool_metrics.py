@@ -0,0 +1,115 @@
+import logging
+import sys
+import time
+from typing import Optional, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+from app.core.metrics import (
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_POOL_CHECKOUT_TIMEOUTS,
+    DB_POOL_IDLE,
+    DB_POOL_IN_USE,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_SLOW_QUERIES,
+    DEPENDENCY_ERRORS,
+    DEPENDENCY_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+_OPERATIONS = {"select", "insert", "update", "delete", "show", "begin", "commit", "rollback"}
+
+# Frames from these packages are skipped when looking for the code that issued a slow query
+_LIBRARY_PREFIXES = ("sqlalchemy", "sqlmodel", "greenlet", "asyncio", "aiomysql", "mysql", "starlette", "fastapi", "anyio")
+
+
+def instrumented_pool_class(base: Type[Pool], engine_name: str) -> Type[Pool]:
+    """
+    Subclass of a queue pool that times every checkout, including the wait for a free connection.
+    The engine name lives on the class so it survives the pool being recreated on dispose().
+    """
+
+    class InstrumentedPool(base):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            except PoolTimeoutError:
+                DB_POOL_CHECKOUT_TIMEOUTS.labels(engine_name).inc()
+                raise
+            finally:
+                DB_POOL_CHECKOUT_SECONDS.labels(engine_name).observe(time.perf_counter() - started)
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+def _application_frame(frame) -> Optional[str]:
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module != __name__ and not module.startswith(_LIBRARY_PREFIXES):
+            return f"{module}:{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
+
+
+def _caller() -> str:
+    """First application frame on the stack, following async sessions back to the awaiting coroutine."""
+    caller = _application_frame(sys._getframe(1))
+    if caller is None:
+        # Async sessions run the driver in a child greenlet, the coroutine is suspended in its parent
+        greenlet = sys.modules.get("greenlet")
+        parent = greenlet.getcurrent().parent if greenlet else None
+        if parent is not None and parent.gr_frame is not None:
+            caller = _application_frame(parent.gr_frame)
+    return caller or "unknown"
+
+
+def _operation(statement: Optional[str]) -> str:
+    """Statement verb (select, insert, ...) as a low-cardinality label."""
+    verb = statement.split(None, 1)[0].lower() if statement and statement.strip() else "unknown"
+    return verb if verb in _OPERATIONS else "other"
+
+
+def instrument_engine(engine: Engine, engine_name: str, slow_query_ms: Optional[float]) -> None:
+    """
+    Export pool gauges and per-statement timings for an engine, and log statements slower than slow_query_ms.
+    Args:
+        engine: Sync engine, or the sync_engine of an async engine
+        engine_name: Label of the engine's metrics
+        slow_query_ms: Threshold for the slow query log, None to disable it
+    """
+    # Read engine.pool on every scrape, dispose() swaps in a new pool object
+    DB_POOL_SIZE.labels(engine_name).set_function(lambda: engine.pool.size())
+    DB_POOL_IN_USE.labels(engine_name).set_function(lambda: engine.pool.checkedout())
+    DB_POOL_IDLE.labels(engine_name).set_function(lambda: engine.pool.checkedin())
+    DB_POOL_OVERFLOW.labels(engine_name).set_function(lambda: engine.pool.overflow())
+
+    threshold = slow_query_ms / 1000 if slow_query_ms is not None else None
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "handle_error")
+    def _record_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started_at"):
+            connection.info["query_started_at"].pop()
+        DEPENDENCY_ERRORS.labels("db", _operation(exception_context.statement)).inc()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        DEPENDENCY_SECONDS.labels("db", _operation(statement)).observe(elapsed)
+        if threshold is not None and elapsed >= threshold:
+            DB_SLOW_QUERIES.labels(engine_name).inc()
+            logger.warning(
+                f"Slow query on {engine_name} took {elapsed * 1000:.1f} ms, called from {_caller()}: "
+                f"{' '.join(statement.split())}"
+            )
@@ -1,8 +1,13 @@
 
+from typing import Dict, Iterable, List, Optional, Set
 from sqlalchemy import and_
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.sql_models import RaceDriver
+from app.services.cache.roster_cache import Roster, RosterCache
+from app.utils.batching import chunked
 import logging
 
 
@@ -11,7 +16,8 @@ class RaceDriverService:
     Service for managing F1 Session Drivers operations.
     """
     
-    def __init__(self):
+    def __init__(self, roster_cache: Optional[RosterCache] = None):
+        self.roster_cache = roster_cache
         self.logger = logging.getLogger(__name__)
 
     def get_all_session_drivers(self, session: Session):
@@ -51,6 +57,53 @@ class RaceDriverService:
             session.rollback()
             self.logger.error(f"Error adding driver: {e}")
 
+    def add_session_drivers(self, session: Session, drivers: List[Dict], batch_size: int = 500) -> int:
+        """
+        Upsert session drivers with one multi-row INSERT ... ON DUPLICATE KEY UPDATE per batch,
+        all batches in a single transaction. Relies on the (race_id, driver_number) unique key
+        instead of looking each driver up first.
+        Args:
+            session: The database session
+            drivers: Rows with race_id, driver_number, driver_name and team
+            batch_size: Maximum number of rows per statement
+        Returns:
+            Number of rows written
+        """
+        if not drivers:
+            return 0
+
+        try:
+            written = 0
+            for batch in chunked(drivers, batch_size):
+                statement = insert(RaceDriver).values(batch)
+                statement = statement.on_duplicate_key_update(
+                    driver_name=statement.inserted.driver_name,
+                    team=statement.inserted.team,
+                )
+                session.exec(statement)
+                written += len(batch)
+            session.commit()
+            self.logger.info(f"Upserted {written} session drivers")
+            return written
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error adding drivers: {e}")
+            raise
+
+    def get_race_ids_with_drivers(self, session: Session, race_ids: Iterable[int]) -> Set[int]:
+        """Return the subset of race_ids that already have drivers stored."""
+        race_ids = list(race_ids)
+        if not race_ids:
+            return set()
+
+        try:
+            query = select(RaceDriver.race_id).where(RaceDriver.race_id.in_(race_ids)).distinct()
+            return set(session.exec(query).all())
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error fetching races with drivers: {e}")
+            return set()
+
     def get_session_drivers(self, session: Session, session_id: int):
         try:
             sql_filter = select(RaceDriver).where(RaceDriver.race_id == session_id)
@@ -59,3 +112,59 @@ class RaceDriverService:
             session.rollback()
             self.logger.error(f"An error occurred: {e}")
             return []
+
+    async def get_session_drivers_async(self, session: AsyncSession, session_id: int) -> List[RaceDriver]:
+        """Async variant of get_session_drivers for the API routes."""
+        try:
+            sql_filter = select(RaceDriver).where(RaceDriver.race_id == session_id)
+            return (await session.exec(sql_filter)).all()
+        except SQLAlchemyError as e:
+            await session.rollback()
+            self.logger.error(f"An error occurred: {e}")
+            return []
+
+    async def get_drivers_by_session_async(
+        self, session: AsyncSession, session_ids: Iterable[int]
+    ) -> Dict[int, List[RaceDriver]]:
+        """
+        Drivers of several sessions with a single IN query.
+        Args:
+            session: The database session
+            session_ids: Session keys to fetch the drivers of
+        Returns:
+            Drivers by session key, sessions without drivers are left out
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        session_ids = list(session_ids)
+        if not session_ids:
+            return {}
+
+        try:
+            query = select(RaceDriver).where(RaceDriver.race_id.in_(session_ids))
+            drivers_by_session: Dict[int, List[RaceDriver]] = {}
+            for driver in (await session.exec(query)).all():
+                drivers_by_session.setdefault(driver.race_id, []).append(driver)
+            return drivers_by_session
+        except SQLAlchemyError as e:
+            await session.rollback()
+            self.logger.error(f"Error fetching drivers of sessions {session_ids}: {e}")
+            raise
+
+    async def get_session_roster_async(self, session: AsyncSession, session_id: int) -> Roster:
+        """Driver roster of a session, served from the roster cache when possible."""
+        if self.roster_cache is not None:
+            roster = await self.roster_cache.get_async(session_id)
+            if roster is not None:
+                return roster
+
+        roster = RosterCache.from_drivers(await self.get_session_drivers_async(session, session_id))
+        # Don't pin an empty roster, it may come from a replica that hasn't seen the sync yet
+        if self.roster_cache is not None and roster:
+            await self.roster_cache.put_async(session_id, roster)
+        return roster
+
+    def invalidate_rosters(self, race_ids: Iterable[int]) -> None:
+        """Drop cached rosters of races whose drivers changed."""
+        if self.roster_cache is not None:
+            self.roster_cache.invalidate(race_ids)
@@ -1,10 +1,13 @@
 
-from typing import List
-from sqlalchemy import and_
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import and_, or_
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.sql_models import Guess, RaceDriver, RaceResult
 from app.models.pydantic_models import DriverPosition
+from app.utils.batching import chunked
 import logging
 
 
@@ -26,6 +29,20 @@ class RaceResultService:
             self.logger.error(f"Error fetching all session results: {e}")
             return []
 
+    def get_race_ids_with_results(self, session: Session, race_ids: Iterable[int]) -> Set[int]:
+        """Return the subset of race_ids that already have a result stored."""
+        race_ids = list(race_ids)
+        if not race_ids:
+            return set()
+
+        try:
+            query = select(RaceResult.race_id).where(RaceResult.race_id.in_(race_ids))
+            return set(session.exec(query).all())
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error fetching races with results: {e}")
+            return set()
+
     def add_race_result(self, session: Session, race_id, first, second, third) -> None:
         try:
             query = RaceResult.race_id == race_id
@@ -53,83 +70,173 @@ class RaceResultService:
             session.rollback()
             self.logger.error(f"An error occurred: {e}")
 
-    def get_race_standing(self, session: Session, session_key: int) -> List[DriverPosition]:
+    def add_race_results(self, session: Session, results: List[Dict], batch_size: int = 500) -> int:
+        """
+        Upsert race results with one multi-row INSERT ... ON DUPLICATE KEY UPDATE per batch,
+        all batches in a single transaction.
+        Args:
+            session: The database session
+            results: Rows with race_id and position_1/2/3_driver_id
+            batch_size: Maximum number of rows per statement
+        Returns:
+            Number of rows written
+        """
+        if not results:
+            return 0
+
         try:
-            query_result = select(RaceResult).where(RaceResult.race_id == session_key)
-            result = session.exec(query_result).first()
-            
-            if not result:
-                self.logger.warning(f"No race result found for session {session_key}")
-                return []
-                
-            self.logger.debug(f"Found result: {result}")
-            
-            query_drivers = []
-            query_drivers.append(
-                select(RaceDriver).where(
-                    and_(
-                        RaceDriver.race_id == session_key,
-                        RaceDriver.driver_number == result.position_1_driver_id,
-                    )
+            written = 0
+            for batch in chunked(results, batch_size):
+                statement = insert(RaceResult).values(batch)
+                statement = statement.on_duplicate_key_update(
+                    position_1_driver_id=statement.inserted.position_1_driver_id,
+                    position_2_driver_id=statement.inserted.position_2_driver_id,
+                    position_3_driver_id=statement.inserted.position_3_driver_id,
                 )
-            )
-            query_drivers.append(
-                select(RaceDriver).where(
-                    and_(
-                        RaceDriver.race_id == session_key,
-                        RaceDriver.driver_number == result.position_2_driver_id,
-                    )
+                session.exec(statement)
+                written += len(batch)
+            session.commit()
+            self.logger.info(f"Upserted {written} race results")
+            return written
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error adding race results: {e}")
+            raise
+
+    def _append_driver_position(
+        self, standing: List[DriverPosition], position: int, driver: Optional[RaceDriver], session_key: int
+    ) -> None:
+        if driver:
+            self.logger.debug(f"Driver at position {position}: {driver}")
+            standing.append(
+                DriverPosition(
+                    position=position,
+                    driver_number=driver.race_driver_id,
+                    driver_name=driver.driver_name,
                 )
             )
-            query_drivers.append(
-                select(RaceDriver).where(
-                    and_(
-                        RaceDriver.race_id == session_key,
-                        RaceDriver.driver_number == result.position_3_driver_id,
-                    )
-                )
+        else:
+            self.logger.warning(f"No driver found at position {position} for session {session_key}")
+
+    @staticmethod
+    def _standings_query(session_keys: List[int]):
+        """
+        Results of the sessions joined with their podium drivers, one row per (result, driver).
+        Outer joined so a result whose drivers aren't synced yet still comes back.
+        """
+        return (
+            select(RaceResult, RaceDriver)
+            .outerjoin(
+                RaceDriver,
+                and_(
+                    RaceDriver.race_id == RaceResult.race_id,
+                    or_(
+                        RaceDriver.driver_number == RaceResult.position_1_driver_id,
+                        RaceDriver.driver_number == RaceResult.position_2_driver_id,
+                        RaceDriver.driver_number == RaceResult.position_3_driver_id,
+                    ),
+                ),
+            )
+            .where(RaceResult.race_id.in_(session_keys))
+        )
+
+    def _group_standings(self, rows) -> Dict[int, List[DriverPosition]]:
+        results: Dict[int, RaceResult] = {}
+        podium_drivers: Dict[int, Dict[int, RaceDriver]] = {}
+        for result, driver in rows:
+            results[result.race_id] = result
+            drivers = podium_drivers.setdefault(result.race_id, {})
+            if driver is not None:
+                drivers[driver.driver_number] = driver
+
+        standings: Dict[int, List[DriverPosition]] = {}
+        for session_key, result in results.items():
+            standing = standings[session_key] = []
+            driver_numbers = (
+                result.position_1_driver_id,
+                result.position_2_driver_id,
+                result.position_3_driver_id,
             )
-            
-            driver_numbers_in_top = []
-            for pos, query in enumerate(query_drivers):
-                driver_at_position = session.exec(query).first()
-                if driver_at_position:
-                    self.logger.debug(f"Driver at position {pos + 1}: {driver_at_position}")
-                    driver_numbers_in_top.append(
-                        DriverPosition(
-                            position=pos + 1,
-                            driver_number=driver_at_position.race_driver_id,
-                            driver_name=driver_at_position.driver_name,
-                        )
-                    )
-                else:
-                    self.logger.warning(f"No driver found at position {pos + 1} for session {session_key}")
-                    
-            return driver_numbers_in_top
+            for pos, driver_number in enumerate(driver_numbers):
+                driver = podium_drivers[session_key].get(driver_number)
+                self._append_driver_position(standing, pos + 1, driver, session_key)
+        return standings
+
+    async def get_race_standings_async(
+        self, session: AsyncSession, session_keys: Iterable[int]
+    ) -> Dict[int, List[DriverPosition]]:
+        """
+        Standings of several sessions with a single query.
+        Args:
+            session: The database session
+            session_keys: Session keys to fetch the standings of
+        Returns:
+            Standings by session key, sessions without a result are left out
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        session_keys = list(session_keys)
+        if not session_keys:
+            return {}
+
+        try:
+            rows = (await session.exec(self._standings_query(session_keys))).all()
+            return self._group_standings(rows)
+        except SQLAlchemyError as e:
+            await session.rollback()
+            self.logger.error(f"Error fetching standings of sessions {session_keys}: {e}")
+            raise
+
+    @staticmethod
+    def _winning_guess_query(session_id: int):
+        """Guess matching the stored result, joined so the result isn't fetched separately."""
+        return (
+            select(Guess)
+            .join(
+                RaceResult,
+                and_(
+                    RaceResult.race_id == Guess.race_id,
+                    Guess.position_1_driver_id == RaceResult.position_1_driver_id,
+                    Guess.position_2_driver_id == RaceResult.position_2_driver_id,
+                    Guess.position_3_driver_id == RaceResult.position_3_driver_id,
+                ),
+            )
+            .where(Guess.race_id == session_id)
+        )
+
+    def get_race_standing(self, session: Session, session_key: int) -> List[DriverPosition]:
+        """Podium of a session, resolved with a single join of the result and its drivers."""
+        try:
+            rows = session.exec(self._standings_query([session_key])).all()
+            if not rows:
+                self.logger.warning(f"No race result found for session {session_key}")
+                return []
+            return self._group_standings(rows)[session_key]
         except SQLAlchemyError as e:
             session.rollback()
             self.logger.error(f"An error occurred: {e}")
             return []
-            
-    def get_winning_guess(self, session: Session, session_id: int):
+
+    async def get_race_standing_async(self, session: AsyncSession, session_key: int) -> List[DriverPosition]:
+        """
+        Async variant of get_race_standing for the API routes.
+        Raises:
+            SQLAlchemyError: If the query fails, so the caller doesn't cache an empty podium
+        """
         try:
-            query_session_result = select(RaceResult).where(
-                RaceResult.race_id == session_id
-            )
-            session_result = session.exec(query_session_result).first()
-            if not session_result:
-                self.logger.info(f"No race result found for session_id: {session_id}")
-                return None
+            rows = (await session.exec(self._standings_query([session_key]))).all()
+            if not rows:
+                self.logger.warning(f"No race result found for session {session_key}")
+                return []
+            return self._group_standings(rows)[session_key]
+        except SQLAlchemyError as e:
+            await session.rollback()
+            self.logger.error(f"An error occurred: {e}")
+            raise
 
-            query_correct_guess = select(Guess).where(
-                and_(
-                    Guess.race_id == session_id,
-                    Guess.position_1_driver_id == session_result.position_1_driver_id,
-                    Guess.position_2_driver_id == session_result.position_2_driver_id,
-                    Guess.position_3_driver_id == session_result.position_3_driver_id
-                )
-            )
-            winning_guess = session.exec(query_correct_guess).first()
+    def get_winning_guess(self, session: Session, session_id: int):
+        try:
+            winning_guess = session.exec(self._winning_guess_query(session_id)).first()
             if not winning_guess:
                 self.logger.info(f"No winning guess found for session_id: {session_id}")
             return winning_guess
@@ -138,4 +245,14 @@ class RaceResultService:
             self.logger.error(f"An error occurred while fetching winning guess: {e}")
             return None
 
-    
\ No newline at end of file
+    async def get_winning_guess_async(self, session: AsyncSession, session_id: int) -> Optional[Guess]:
+        """Async variant of get_winning_guess for the API routes."""
+        try:
+            winning_guess = (await session.exec(self._winning_guess_query(session_id))).first()
+            if not winning_guess:
+                self.logger.info(f"No winning guess found for session_id: {session_id}")
+            return winning_guess
+        except Exception as e:
+            await session.rollback()
+            self.logger.error(f"An error occurred while fetching winning guess: {e}")
+            return None
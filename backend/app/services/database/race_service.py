@@ -1,7 +1,15 @@
-from typing import List
+import base64
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, or_
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.exc import SQLAlchemyError
-from app.models.sql_models import Race
+from sqlalchemy.orm import joinedload
+from app.models.sql_models import Race, SyncState
+from app.models.pydantic_models import RacePage, RaceSummary
+from app.utils.batching import chunked
 import logging
 
 class RaceService:
@@ -36,15 +44,180 @@ class RaceService:
             session.rollback()
             self.logger.error(f"Error adding race: {e}")
 
+    def add_races(self, session: Session, races: List[Dict], batch_size: int = 500) -> int:
+        """
+        Upsert races with one multi-row INSERT ... ON DUPLICATE KEY UPDATE per batch,
+        all batches in a single transaction.
+        Args:
+            session: The database session
+            races: Rows with race_id, race_name, race_type and race_date
+            batch_size: Maximum number of rows per statement
+        Returns:
+            Number of rows written
+        """
+        if not races:
+            return 0
+
+        try:
+            written = 0
+            for batch in chunked(races, batch_size):
+                statement = insert(Race).values(batch)
+                statement = statement.on_duplicate_key_update(
+                    race_name=statement.inserted.race_name,
+                    race_type=statement.inserted.race_type,
+                    race_date=statement.inserted.race_date,
+                )
+                session.exec(statement)
+                written += len(batch)
+            session.commit()
+            self.logger.info(f"Upserted {written} races")
+            return written
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error adding races: {e}")
+            raise
+
+    @staticmethod
+    def _races_query(number_of_races: int = 0):
+        sql_query = select(Race).order_by(Race.race_date.desc(), Race.race_id.desc())
+
+        if number_of_races > 0:
+            sql_query = sql_query.limit(number_of_races)
+        return sql_query
+
     def get_races(self, session: Session, number_of_races: int = 0) -> List[Race]:
         try:
-            sql_query = select(Race).order_by(Race.race_date.desc())
+            return session.exec(self._races_query(number_of_races)).all()
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"An error occurred: {e}")
+            return []
 
-            if number_of_races > 0:
-                sql_query = sql_query.limit(number_of_races)
+    @staticmethod
+    def _race_details_query(race_id: int):
+        # Both relationships joined into the race row: a single statement instead of one per
+        # relationship on first access. A race has at most one result, so the join doesn't multiply rows.
+        return (
+            select(Race)
+            .where(Race.race_id == race_id)
+            .options(joinedload(Race.race_drivers), joinedload(Race.race_result))
+        )
 
-            return session.exec(sql_query).all()
+    def get_race_details(self, session: Session, race_id: int) -> Optional[Race]:
+        """
+        Load a race with its drivers and result in one round trip.
+        Args:
+            session: The database session
+            race_id: Session key of the race
+        Returns:
+            The race with race_drivers and race_result loaded, or None if it doesn't exist
+        """
+        try:
+            return session.exec(self._race_details_query(race_id)).unique().first()
         except SQLAlchemyError as e:
             session.rollback()
             self.logger.error(f"An error occurred: {e}")
-            return []
\ No newline at end of file
+            return None
+
+    async def get_race_details_async(self, session: AsyncSession, race_id: int) -> Optional[Race]:
+        """Async variant of get_race_details, the relationships can't be lazy loaded on an AsyncSession."""
+        try:
+            return (await session.exec(self._race_details_query(race_id))).unique().first()
+        except SQLAlchemyError as e:
+            await session.rollback()
+            self.logger.error(f"An error occurred: {e}")
+            return None
+
+    @staticmethod
+    def encode_cursor(race_date: datetime, race_id: int) -> str:
+        """Opaque cursor pointing just after the given race in (race_date, race_id) descending order."""
+        return base64.urlsafe_b64encode(f"{race_date.isoformat()}|{race_id}".encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """
+        Raises:
+            ValueError: If the cursor wasn't produced by encode_cursor
+        """
+        try:
+            race_date, race_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return datetime.fromisoformat(race_date), int(race_id)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    @classmethod
+    def _race_summaries_query(
+        cls,
+        limit: int = 0,
+        cursor: Optional[str] = None,
+        year: Optional[int] = None,
+        session_type: Optional[str] = None,
+    ):
+        """Keyset query over the (race_date, race_id) index, newest first, selecting only the listed columns."""
+        sql_query = (
+            select(Race.race_id, Race.race_name, Race.race_type, Race.race_date, SyncState.last_synced_at)
+            .outerjoin(SyncState, SyncState.race_id == Race.race_id)
+            .order_by(Race.race_date.desc(), Race.race_id.desc())
+        )
+
+        if cursor:
+            cursor_date, cursor_id = cls.decode_cursor(cursor)
+            sql_query = sql_query.where(
+                or_(
+                    Race.race_date < cursor_date,
+                    and_(Race.race_date == cursor_date, Race.race_id < cursor_id),
+                )
+            )
+        if year is not None:
+            # Range instead of YEAR(race_date) so the index can be used
+            sql_query = sql_query.where(
+                and_(Race.race_date >= datetime(year, 1, 1), Race.race_date < datetime(year + 1, 1, 1))
+            )
+        if session_type:
+            sql_query = sql_query.where(Race.race_type == session_type)
+        if limit > 0:
+            sql_query = sql_query.limit(limit)
+        return sql_query
+
+    def _race_page(self, rows, limit: int) -> RacePage:
+        races = [
+            RaceSummary(race_id=race_id, race_name=race_name, race_type=race_type, race_date=race_date)
+            for race_id, race_name, race_type, race_date, _ in rows
+        ]
+        synced_at = [last_synced_at for *_, last_synced_at in rows if last_synced_at is not None]
+
+        # A full page may have more races after it, a short one is the last
+        next_cursor = None
+        if limit > 0 and len(races) == limit:
+            next_cursor = self.encode_cursor(races[-1].race_date, races[-1].race_id)
+        return RacePage(races=races, next_cursor=next_cursor, last_modified=max(synced_at, default=None))
+
+    async def get_race_page_async(
+        self,
+        session: AsyncSession,
+        limit: int = 0,
+        cursor: Optional[str] = None,
+        year: Optional[int] = None,
+        session_type: Optional[str] = None,
+    ) -> RacePage:
+        """
+        Page of race summaries, newest first.
+        Args:
+            session: The database session
+            limit: Page size, 0 for every matching race
+            cursor: next_cursor of the previous page
+            year: Only races of this season
+            session_type: Only sessions of this type, e.g. "Race" or "Sprint"
+        Returns:
+            The races and the cursor of the next page, if there may be one
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        sql_query = self._race_summaries_query(limit, cursor, year, session_type)
+        try:
+            rows = (await session.exec(sql_query)).all()
+        except SQLAlchemyError as e:
+            await session.rollback()
+            self.logger.error(f"An error occurred: {e}")
+            raise
+        return self._race_page(rows, limit)
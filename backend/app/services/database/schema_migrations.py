@@ -0,0 +1,89 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Set
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[3] / "alembic.ini"
+
+# Revision matching the schema that create_all produced before migrations existed
+BASELINE_REVISION = "0001"
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is not at the revision this code expects."""
+
+
+def get_alembic_config() -> Config:
+    return Config(str(ALEMBIC_INI))
+
+
+@lru_cache(maxsize=1)
+def get_head_revisions() -> Set[str]:
+    """Revisions shipped with this code, read from the migration scripts on disk."""
+    return set(ScriptDirectory.from_config(get_alembic_config()).get_heads())
+
+
+def get_current_revisions(engine: Engine) -> Set[str]:
+    """Revisions recorded in the database's alembic_version table, empty when it is unversioned."""
+    with engine.connect() as connection:
+        return set(MigrationContext.configure(connection).get_current_heads())
+
+
+def check_schema_version(engine: Engine) -> None:
+    """
+    Fast startup check: a single read of alembic_version, no DDL and no catalog introspection.
+    Raises:
+        SchemaVersionError: If the database is not at the head revision
+    """
+    current = get_current_revisions(engine)
+    expected = get_head_revisions()
+    if current != expected:
+        raise SchemaVersionError(
+            f"Database schema is at {sorted(current) or 'no revision'}, expected {sorted(expected)}. "
+            f"Run `python -m app.services.migrate` before starting the application."
+        )
+
+
+def _server_url() -> str:
+    return f"mysql+mysqlconnector://{settings.mysql_user}:{settings.mysql_password}@{settings.host_name}/"
+
+
+def migrate(revision: str = "head") -> None:
+    """
+    One-shot migration: create the database if needed, then upgrade it to the given revision.
+    Databases bootstrapped by create_all before migrations existed are stamped at the baseline first.
+    Args:
+        revision: Target revision
+    """
+    server_engine = create_engine(_server_url(), poolclass=NullPool)
+    try:
+        with server_engine.connect() as connection:
+            connection.execute(text(f"CREATE DATABASE IF NOT EXISTS {settings.database_name}"))
+            connection.commit()
+    finally:
+        server_engine.dispose()
+
+    engine = create_engine(f"{_server_url()}{settings.database_name}", poolclass=NullPool)
+    try:
+        current = get_current_revisions(engine)
+        tables = set(inspect(engine).get_table_names())
+    finally:
+        engine.dispose()
+
+    config = get_alembic_config()
+    if not current and "race" in tables:
+        logger.info(f"Unversioned schema found, stamping baseline revision {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+
+    logger.info(f"Upgrading database '{settings.database_name}' from {sorted(current) or 'no revision'} to {revision}")
+    command.upgrade(config, revision)
@@ -0,0 +1,149 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Set
+from sqlalchemy import and_, or_, update
+from sqlmodel import Session, select
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.sql_models import SyncState
+from app.utils.batching import chunked
+import logging
+
+
+class SyncStateService:
+    """
+    Service for tracking which F1 sessions still need drivers or results synced.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def get_known_race_ids(self, session: Session, race_ids: Iterable[int]) -> Set[int]:
+        """Return the subset of race_ids that already have a sync state."""
+        race_ids = list(race_ids)
+        if not race_ids:
+            return set()
+
+        try:
+            query = select(SyncState.race_id).where(SyncState.race_id.in_(race_ids))
+            return set(session.exec(query).all())
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error fetching sync state: {e}")
+            raise
+
+    def add_sessions(self, session: Session, states: List[Dict], batch_size: int = 500) -> int:
+        """
+        Upsert sync state rows for newly synced sessions.
+        Args:
+            session: The database session
+            states: Rows with race_id, session_start and session_end
+            batch_size: Maximum number of rows per statement
+        Returns:
+            Number of rows written
+        """
+        if not states:
+            return 0
+
+        try:
+            written = 0
+            for batch in chunked(states, batch_size):
+                statement = insert(SyncState).values(batch)
+                statement = statement.on_duplicate_key_update(
+                    session_start=statement.inserted.session_start,
+                    session_end=statement.inserted.session_end,
+                    last_synced_at=statement.inserted.last_synced_at,
+                )
+                session.exec(statement)
+                written += len(batch)
+            session.commit()
+            return written
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error adding sync state: {e}")
+            raise
+
+    def get_pending_driver_race_ids(self, session: Session) -> List[int]:
+        """Sessions whose drivers have not been synced yet."""
+        try:
+            query = select(SyncState.race_id).where(SyncState.drivers_synced == False)  # noqa: E712
+            return list(session.exec(query).all())
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error fetching pending driver syncs: {e}")
+            raise
+
+    def get_pending_result_race_ids(self, session: Session, now: datetime) -> List[int]:
+        """Sessions that have started but whose final results have not been synced yet."""
+        try:
+            query = select(SyncState.race_id).where(
+                and_(
+                    SyncState.results_synced == False,  # noqa: E712
+                    or_(SyncState.session_start == None, SyncState.session_start <= now),  # noqa: E711
+                )
+            )
+            return list(session.exec(query).all())
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error fetching pending result syncs: {e}")
+            raise
+
+    def get_finished_race_ids(self, session: Session, race_ids: Iterable[int], finished_before: datetime) -> Set[int]:
+        """Return the subset of race_ids whose session ended before the given time."""
+        race_ids = list(race_ids)
+        if not race_ids:
+            return set()
+
+        try:
+            query = select(SyncState.race_id).where(
+                and_(
+                    SyncState.race_id.in_(race_ids),
+                    SyncState.session_end != None,  # noqa: E711
+                    SyncState.session_end < finished_before,
+                )
+            )
+            return set(session.exec(query).all())
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error fetching finished sessions: {e}")
+            raise
+
+    def get_live_race_ids(self, session: Session, now: datetime, ended_after: datetime) -> List[int]:
+        """Sessions that started before now and did not end before ended_after."""
+        try:
+            query = select(SyncState.race_id).where(
+                and_(
+                    SyncState.session_start <= now,
+                    SyncState.session_end >= ended_after,
+                )
+            )
+            return list(session.exec(query).all())
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error fetching live sessions: {e}")
+            raise
+
+    def mark_synced(self, session: Session, race_ids: Iterable[int], now: datetime, **flags: bool) -> None:
+        """
+        Update the sync flags and last synced timestamp for the given sessions.
+        Args:
+            session: The database session
+            race_ids: Sessions to update
+            now: Timestamp stored as last_synced_at
+            flags: drivers_synced and/or results_synced values to set
+        """
+        race_ids = list(race_ids)
+        if not race_ids:
+            return
+
+        try:
+            statement = (
+                update(SyncState)
+                .where(SyncState.race_id.in_(race_ids))
+                .values(last_synced_at=now, **flags)
+            )
+            session.exec(statement)
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.logger.error(f"Error updating sync state: {e}")
+            raise
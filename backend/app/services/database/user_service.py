@@ -1,16 +1,22 @@
 from datetime import datetime, timezone
 import logging
-import dateutil
 from sqlmodel import and_, select
+from sqlalchemy import distinct, func
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session
-import sqlmodel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Dict, Iterable, Optional
 from app.models.sql_models import User, Guess, RaceDriver, Race
+from app.services.database.race_driver_service import RaceDriverService
 
 
 class UserService:
     """Service for managing user operations."""
 
+    def __init__(self, race_driver_service: Optional[RaceDriverService] = None):
+        self.race_driver_service = race_driver_service
+
     def add_user(self, session: Session, username: str, email: str):
         try:
             if self.get_user(session, email):
@@ -32,86 +38,151 @@ class UserService:
             session.rollback()
             print(f"An error occurred: {e}")
 
+    async def get_user_async(self, session: AsyncSession, email: str):
+        """Async variant of get_user for the API routes."""
+        try:
+            sql_filter = select(User).where(and_(User.email == email))
+            return (await session.exec(sql_filter)).first()
+        except SQLAlchemyError as e:
+            await session.rollback()
+            print(f"An error occurred: {e}")
+
+    @staticmethod
+    def _guess_query(user_email: str, event_id: int):
+        # Guesses reference the user by id, resolve the email through the user table
+        return (
+            select(Guess)
+            .join(User, User.user_id == Guess.user_id)
+            .where(and_(User.email == user_email, Guess.race_id == event_id))
+        )
+
     def get_guess(self, session: Session, user_email: str, event_id: int) -> Guess:
         try:
-            sql_filter = select(Guess).where(
-                and_(Guess.user_email == user_email, Guess.race_id == event_id)
-            )
-            return session.exec(sql_filter).first()
+            return session.exec(self._guess_query(user_email, event_id)).first()
         except SQLAlchemyError as e:
             session.rollback()
             print(f"An error occurred: {e}")
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
 
+    async def get_guess_async(self, session: AsyncSession, user_email: str, event_id: int) -> Guess:
+        """Async variant of get_guess for the API routes."""
+        try:
+            return (await session.exec(self._guess_query(user_email, event_id))).first()
+        except SQLAlchemyError as e:
+            await session.rollback()
+            print(f"An error occurred: {e}")
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+
+    async def get_guesses_async(
+        self, session: AsyncSession, user_email: str, event_ids: Iterable[int]
+    ) -> Dict[int, Guess]:
+        """
+        The user's guesses for several sessions with a single IN query.
+        Args:
+            session: The database session
+            user_email: Email of the user
+            event_ids: Session keys to fetch the guesses of
+        Returns:
+            Guesses by session key, sessions without a guess are left out
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        event_ids = list(event_ids)
+        if not event_ids:
+            return {}
+
+        try:
+            query = (
+                select(Guess)
+                .join(User, User.user_id == Guess.user_id)
+                .where(and_(User.email == user_email, Guess.race_id.in_(event_ids)))
+            )
+            return {guess.race_id: guess for guess in (await session.exec(query)).all()}
+        except SQLAlchemyError as e:
+            await session.rollback()
+            print(f"An error occurred: {e}")
+            raise
+
+    @staticmethod
+    def _guess_validation_query(user_email: str, race_id: int, driver_numbers, count_drivers: bool = True):
+        """
+        Everything needed to validate a guess in one round trip: the race start, the user's id
+        and, unless the race roster is already cached, how many of the guessed drivers take part in the race.
+        """
+        user_id = select(User.user_id).where(User.email == user_email).limit(1).scalar_subquery()
+        columns = [Race.race_date, user_id]
+        if count_drivers:
+            columns.append(
+                select(func.count(distinct(RaceDriver.driver_number)))
+                .where(
+                    and_(
+                        RaceDriver.race_id == race_id,
+                        RaceDriver.driver_number.in_(driver_numbers),
+                    )
+                )
+                .scalar_subquery()
+            )
+        return select(*columns).where(Race.race_id == race_id)
+
+    def _cached_roster(self, race_id: int):
+        if self.race_driver_service is None or self.race_driver_service.roster_cache is None:
+            return None
+        return self.race_driver_service.roster_cache.get(race_id)
+
     def add_guess(
         self,
         user_email: str,
         session: Session,
         guess: Guess,
     ):
-        user = self.get_user(session, user_email)
-        # Validate guess drivers
-        sql_filter_1 = select(RaceDriver).where(
-            and_(
-                RaceDriver.race_id == guess.race_id,
-                RaceDriver.driver_number == guess.position_1_driver_id,
-            )
-        )
-        sql_filter_2 = select(RaceDriver).where(
-            and_(
-                RaceDriver.race_id == guess.race_id,
-                RaceDriver.driver_number == guess.position_2_driver_id,
-            )
-        )
-        sql_filter_3 = select(RaceDriver).where(
-            and_(
-                RaceDriver.race_id == guess.race_id,
-                RaceDriver.driver_number == guess.position_3_driver_id,
-            )
-        )
+        driver_numbers = {
+            guess.position_1_driver_id,
+            guess.position_2_driver_id,
+            guess.position_3_driver_id,
+        }
+        if len(driver_numbers) != 3:
+            raise Exception("Invalid guess, the podium needs three different drivers")
 
-        if not (
-            session.exec(sql_filter_1).first()
-            and session.exec(sql_filter_2).first()
-            and session.exec(sql_filter_3).first()
-        ):
+        roster = self._cached_roster(guess.race_id)
+        if roster is not None and not driver_numbers.issubset(roster):
             raise Exception("Invalid guess, race and drivers don't match")
 
-        # Validate guess time
-        sql_filter_race = sqlmodel.select(Race).where(Race.race_id == guess.race_id)
-        race = session.exec(sql_filter_race).first()
+        validation = session.exec(
+            self._guess_validation_query(user_email, guess.race_id, driver_numbers, count_drivers=roster is None)
+        ).first()
 
-        if race is None:
+        if validation is None:
             raise Exception("Invalid guess, race does not exist")
-        elif dateutil.parser.isoparse(race.race_date) <= datetime.now(timezone.utc):
+
+        race_date, user_id, *matching_drivers = validation
+        if user_id is None:
+            raise Exception("Invalid guess, user does not exist")
+        if matching_drivers and matching_drivers[0] != len(driver_numbers):
+            raise Exception("Invalid guess, race and drivers don't match")
+        if race_date <= datetime.now(timezone.utc).replace(tzinfo=None):
             raise Exception("Invalid guess, race already STARTED or FINISHED")
 
-        # Validate user has no guess yet for this event
-        existing_guess = self.get_guess(session, user.email, race.race_id)
-        if existing_guess is not None:
-            # Modify the current guess
-            existing_guess.position_1_driver_id = guess.position_1_driver_id
-            existing_guess.position_2_driver_id = guess.position_2_driver_id
-            existing_guess.position_3_driver_id = guess.position_3_driver_id
-            try:
-                session.commit()
-                session.refresh(existing_guess)
-            except SQLAlchemyError as e:
-                session.rollback()
-                logging.error(f"Error updating guess: {e}")
-                raise
-            logging.info(f"Guess updated successfully for user: {guess.user_email}")
-        else:
-            new_guess = Guess(
-                user_id=user.user_id,
-                race_id=guess.race_id,
-                position_1_driver_id=guess.position_1_driver_id,
-                position_2_driver_id=guess.position_2_driver_id,
-                position_3_driver_id=guess.position_3_driver_id,
-            )
-            session.add(new_guess)
+        # Insert or modify the user's guess for this race in one statement,
+        # the (user_id, race_id) unique key makes concurrent submissions safe
+        statement = insert(Guess).values(
+            user_id=user_id,
+            race_id=guess.race_id,
+            position_1_driver_id=guess.position_1_driver_id,
+            position_2_driver_id=guess.position_2_driver_id,
+            position_3_driver_id=guess.position_3_driver_id,
+        )
+        statement = statement.on_duplicate_key_update(
+            position_1_driver_id=statement.inserted.position_1_driver_id,
+            position_2_driver_id=statement.inserted.position_2_driver_id,
+            position_3_driver_id=statement.inserted.position_3_driver_id,
+        )
+        try:
+            session.exec(statement)
             session.commit()
-            logging.info(
-                f"Guess added successfully with guess_id: {new_guess.guess_id}"
-            )
+        except SQLAlchemyError as e:
+            session.rollback()
+            logging.error(f"Error saving guess: {e}")
+            raise
+        logging.info(f"Guess saved successfully for user: {user_email}, race: {guess.race_id}")
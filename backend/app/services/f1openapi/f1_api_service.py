@@ -3,7 +3,15 @@
 import requests
 import time
 import logging
-from typing import Optional, Dict, List, Any
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Any, Set
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.core.metrics import dependency_span
+from app.services.f1openapi.rate_limiter import TokenBucketRateLimiter
+from app.services.f1openapi.response_cache import CachedResponse, ResponseCache
 
 """
 Service class to interact with F1 open API
@@ -16,10 +24,153 @@ For now get the following info for basic functionality
 class F1API:
     """Service for interacting with the F1 Open API."""
     
-    def __init__(self, base_url: str = "https://api.openf1.org/v1", timeout: int = 30):
-        self.base_url = base_url
-        self.timeout = timeout
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Optional[int] = None,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        pool_block: Optional[bool] = None,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        self.base_url = base_url or settings.f1_api_base_url
+        self.timeout = timeout or settings.f1_api_timeout
         self.logger = logging.getLogger(__name__)
+        self._session = self._create_session(
+            pool_connections or settings.f1_api_pool_connections,
+            pool_maxsize or settings.f1_api_pool_maxsize,
+            settings.f1_api_pool_block if pool_block is None else pool_block,
+        )
+        # Shared by every thread using this client, so concurrent syncs stay under the API limits
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter(
+            settings.f1_api_rate_limit, settings.f1_api_rate_limit_burst
+        )
+        self.cache = cache if cache is not None else self._create_cache()
+        # Session keys whose data can no longer change, learned from /sessions responses
+        self._finished_sessions: Set[int] = set()
+        self._finished_lock = threading.Lock()
+
+    @staticmethod
+    def _create_cache() -> Optional[ResponseCache]:
+        """Create the on-disk response cache from settings, or None if it is disabled."""
+        if not settings.f1_cache_dir:
+            return None
+        return ResponseCache(
+            settings.f1_cache_dir,
+            settings.f1_cache_max_bytes,
+            settings.f1_cache_default_ttl,
+            settings.f1_cache_ttls,
+        )
+
+    @staticmethod
+    def _create_session(pool_connections: int, pool_maxsize: int, pool_block: bool) -> requests.Session:
+        """
+        Create a keep-alive HTTP session backed by a connection pool.
+
+        Args:
+            pool_connections: Number of per-host pools to keep around
+            pool_maxsize: Maximum number of connections kept open per host
+            pool_block: Block when the per-host limit is reached instead of opening extra connections
+
+        Returns:
+            Configured requests session
+        """
+        session = requests.Session()
+        # Retries are handled in _get, so the adapter must not retry on its own
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=0,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive", "Accept": "application/json"})
+        return session
+
+    def get_connection_stats(self) -> Dict[str, int]:
+        """
+        Report how many connections were opened (TCP/TLS handshakes) and how many
+        requests reused an already open connection.
+        """
+        connections = 0
+        requests_made = 0
+        # The same adapter is mounted for http and https, count it once
+        adapters = {id(adapter): adapter for adapter in self._session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                connections += pool.num_connections
+                requests_made += pool.num_requests
+        return {
+            "requests": requests_made,
+            "handshakes": connections,
+            "reused": max(requests_made - connections, 0),
+        }
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Report response cache hits, misses and revalidations."""
+        return dict(self.cache.stats) if self.cache else {}
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._session.close()
+        if self.cache:
+            self.cache.close()
+
+    @staticmethod
+    def _finished_session_keys(data: List[Dict]) -> Set[int]:
+        """Keys of the sessions in a /sessions response that ended more than the grace period ago."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.f1_cache_finished_grace)
+        finished = set()
+        for session_data in data:
+            date_end = session_data.get("date_end")
+            if date_end and datetime.fromisoformat(date_end) < cutoff:
+                finished.add(session_data["session_key"])
+        return finished
+
+    def _remember_finished_sessions(self, endpoint: str, data: Any) -> None:
+        """Record which sessions in a /sessions response have ended and can be cached forever."""
+        if endpoint != "sessions" or not isinstance(data, list):
+            return
+
+        finished = self._finished_session_keys(data)
+        with self._finished_lock:
+            self._finished_sessions |= finished
+
+    def _is_immutable(self, endpoint: str, params: Optional[Dict[str, Any]], data: Any = None) -> bool:
+        """
+        A response is immutable when it only covers a session that has already finished,
+        or when it lists the sessions of a past season that have all finished.
+        """
+        if not params:
+            return False
+        if endpoint == "sessions" and "year" in params:
+            # A season can't gain sessions once it is over, the current one still can
+            return (
+                int(params["year"]) < datetime.now(timezone.utc).year
+                and isinstance(data, list)
+                and bool(data)
+                and len(self._finished_session_keys(data)) == len(data)
+            )
+        if "session_key" not in params:
+            return False
+        with self._finished_lock:
+            return int(params["session_key"]) in self._finished_sessions
+
+    @staticmethod
+    def _is_cacheable(params: Optional[Dict[str, Any]]) -> bool:
+        """Incremental queries using range filters (e.g. date>) are never repeated, so skip caching them."""
+        return not any(">" in key or "<" in key for key in (params or {}))
+
+    def _cached_result(self, endpoint: str, cached: CachedResponse) -> Any:
+        data = cached.json()
+        self._remember_finished_sessions(endpoint, data)
+        return data
 
     def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, retries: int = 3, backoff_factor: int = 2) -> Optional[List[Dict]]:
         """
@@ -35,11 +186,25 @@ class F1API:
             JSON response data or None if failed
         """
         url = f"{self.base_url}/{endpoint}"
-        
+
+        use_cache = self.cache is not None and self._is_cacheable(params)
+        cached = self.cache.get(endpoint, params) if use_cache else None
+        if cached is not None and cached.is_fresh:
+            return self._cached_result(endpoint, cached)
+
         for attempt in range(retries):
             try:
-                response = requests.get(url, params=params, timeout=self.timeout)
-                
+                self.rate_limiter.acquire()
+                headers = cached.conditional_headers() if cached is not None else None
+                with dependency_span("f1api", endpoint):
+                    response = self._session.get(url, params=params, headers=headers, timeout=self.timeout)
+
+                # Cached copy is still valid
+                if response.status_code == 304 and cached is not None:
+                    data = self._cached_result(endpoint, cached)
+                    self.cache.touch(cached, endpoint, self._is_immutable(endpoint, params, data))
+                    return data
+
                 # Log error responses
                 if response.status_code >= 400:
                     self.logger.error(f"API Error {response.status_code}: {response.text}")
@@ -48,8 +213,9 @@ class F1API:
                 if response.status_code == 429:
                     retry_after = int(response.headers.get("Retry-After", 60))
                     self.logger.warning(f"Rate limit exceeded. Retrying in {retry_after} seconds...")
-                    time.sleep(retry_after)
-                    continue  # Retry immediately after sleeping
+                    # Pause the shared limiter so every worker thread backs off, not just this one
+                    self.rate_limiter.pause(retry_after)
+                    continue  # Retry once the limiter lets requests through again
 
                 # Handle 5xx errors with retries
                 if 500 <= response.status_code < 600:
@@ -68,10 +234,22 @@ class F1API:
                         self.logger.warning("API returned an empty response.")
                         return None
                     try:
-                        return response.json()
+                        data = response.json()
                     except requests.exceptions.JSONDecodeError:
                         self.logger.warning("API returned invalid JSON.")
                         return None
+
+                    self._remember_finished_sessions(endpoint, data)
+                    if use_cache:
+                        self.cache.set(
+                            endpoint,
+                            params,
+                            response.text,
+                            response.headers.get("ETag"),
+                            response.headers.get("Last-Modified"),
+                            self._is_immutable(endpoint, params, data),
+                        )
+                    return data
                 
                 # Return response for other success cases
                 return response.json()
@@ -136,4 +314,63 @@ class F1API:
             self.logger.warning(f"No data for session {session_key}, position {position_number}")
             return None
 
-        return result[-1] if result else None  # Return final position data
\ No newline at end of file
+        return result[-1] if result else None  # Return final position data
+
+    def get_session_classification(self, session_key: str) -> Optional[List[Dict]]:
+        """
+        Get the final classification of every driver in a session with a single request.
+
+        Args:
+            session_key: Session identifier
+
+        Returns:
+            Latest position entry per driver ordered by position, or None
+        """
+        params = {"session_key": session_key}
+
+        # The position stream holds every position change in the session,
+        # the last entry per driver is their final position
+        result = self._get("position", params)
+        if not result:
+            self.logger.warning(f"No position data for session {session_key}")
+            return None
+
+        latest_by_driver: Dict[int, Dict] = {}
+        for entry in result:
+            current = latest_by_driver.get(entry["driver_number"])
+            if current is None or entry["date"] >= current["date"]:
+                latest_by_driver[entry["driver_number"]] = entry
+
+        return sorted(latest_by_driver.values(), key=lambda entry: entry["position"])
+
+    def get_positions_since(self, session_key: str, since: Optional[str] = None) -> Optional[List[Dict]]:
+        """
+        Get position changes in a session newer than the given date cursor.
+
+        Args:
+            session_key: Session identifier
+            since: ISO date of the last entry already seen, or None for the full stream
+
+        Returns:
+            Position entries or None
+        """
+        params = {"session_key": session_key}
+        if since:
+            params["date>"] = since
+        return self._get("position", params)
+
+    def get_intervals_since(self, session_key: str, since: Optional[str] = None) -> Optional[List[Dict]]:
+        """
+        Get gaps to the leader and to the car ahead newer than the given date cursor.
+
+        Args:
+            session_key: Session identifier
+            since: ISO date of the last entry already seen, or None for the full stream
+
+        Returns:
+            Interval entries or None
+        """
+        params = {"session_key": session_key}
+        if since:
+            params["date>"] = since
+        return self._get("intervals", params)
@@ -0,0 +1,59 @@
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class LiveSessionTracker:
+    """
+    Running classification of a live session built from incremental F1 open API data.
+    The cursors hold the date of the newest entry seen, so the next poll only asks for newer rows.
+    """
+    session_key: int
+    position_cursor: Optional[str] = None
+    interval_cursor: Optional[str] = None
+    positions: Dict[int, int] = field(default_factory=dict)
+    intervals: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    def apply_positions(self, entries: Optional[List[Dict]]) -> Dict[int, int]:
+        """Apply new position rows and return the drivers whose position changed."""
+        changed = {}
+        for entry in sorted(entries or [], key=lambda entry: entry["date"]):
+            driver_number = entry["driver_number"]
+            if self.positions.get(driver_number) != entry["position"]:
+                self.positions[driver_number] = entry["position"]
+                changed[driver_number] = entry["position"]
+            self.position_cursor = entry["date"]
+        return changed
+
+    def apply_intervals(self, entries: Optional[List[Dict]]) -> Dict[int, Dict[str, Any]]:
+        """Apply new interval rows and return the drivers whose gaps changed."""
+        changed = {}
+        for entry in sorted(entries or [], key=lambda entry: entry["date"]):
+            driver_number = entry["driver_number"]
+            gaps = {"gap_to_leader": entry.get("gap_to_leader"), "interval": entry.get("interval")}
+            if self.intervals.get(driver_number) != gaps:
+                self.intervals[driver_number] = gaps
+                changed[driver_number] = gaps
+            self.interval_cursor = entry["date"]
+        return changed
+
+    def top(self, count: int = 3) -> List[int]:
+        """Driver numbers of the current top positions."""
+        ordered = sorted(self.positions.items(), key=lambda item: item[1])
+        return [driver_number for driver_number, _ in ordered[:count]]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, payload: str) -> "LiveSessionTracker":
+        data = json.loads(payload)
+        # JSON object keys are strings, driver numbers are ints
+        return cls(
+            session_key=data["session_key"],
+            position_cursor=data["position_cursor"],
+            interval_cursor=data["interval_cursor"],
+            positions={int(number): position for number, position in data["positions"].items()},
+            intervals={int(number): gaps for number, gaps in data["intervals"].items()},
+        )
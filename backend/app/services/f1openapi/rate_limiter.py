@@ -0,0 +1,50 @@
+import threading
+import time
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket shared by every request an F1API instance makes.
+    Tokens refill at `rate` per second up to `capacity`. A 429 response pauses
+    the whole bucket until the server's Retry-After has passed.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def acquire(self) -> None:
+        """Block until a token is available and no Retry-After pause is active."""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait_time = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for the given number of seconds."""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            # Start refilling from an empty bucket once the pause is over
+            self._tokens = 0.0
+            self._updated_at = self._paused_until
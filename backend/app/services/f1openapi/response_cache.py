@@ -0,0 +1,158 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+
+@dataclass
+class CachedResponse:
+    """A single cached F1 open API response."""
+    key: str
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+    immutable: bool
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.immutable or self.expires_at > time.time()
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for revalidating this entry with the API."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    SQLite backed cache of F1 open API responses, keyed by endpoint and query parameters.
+    Entries expire after a per-endpoint TTL unless marked immutable (finished sessions).
+    The least recently used entries are evicted once the cache grows over max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, default_ttl: int, endpoint_ttls: Optional[Dict[str, int]] = None):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "responses.sqlite3")
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = endpoint_ttls or {}
+        self.stats = {"hits": 0, "stale": 0, "misses": 0, "revalidated": 0, "evicted": 0}
+
+        self._lock = threading.Lock()
+        # Shared between the sync worker threads, access is serialized with the lock
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                immutable INTEGER NOT NULL DEFAULT 0,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS ix_responses_accessed_at ON responses (accessed_at)")
+        self._connection.commit()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build a stable cache key from the endpoint and its query parameters."""
+        query = urlencode(sorted((params or {}).items()))
+        return f"{endpoint}?{query}"
+
+    def ttl_for(self, endpoint: str) -> int:
+        return self.endpoint_ttls.get(endpoint, self.default_ttl)
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[CachedResponse]:
+        """Return the cached entry, fresh or stale, or None if there is none."""
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, etag, last_modified, expires_at, immutable FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._connection.commit()
+
+        entry = CachedResponse(key, row[0], row[1], row[2], row[3], bool(row[4]))
+        self.stats["hits" if entry.is_fresh else "stale"] += 1
+        return entry
+
+    def set(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        body: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        immutable: bool = False,
+    ) -> None:
+        """Store a response and evict old entries if the cache is over its size limit."""
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                """
+                REPLACE INTO responses (key, body, etag, last_modified, expires_at, immutable, size, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, body, etag, last_modified, now + self.ttl_for(endpoint), int(immutable), len(body), now),
+            )
+            self._evict()
+            self._connection.commit()
+
+    def touch(self, entry: CachedResponse, endpoint: str, immutable: bool = False) -> None:
+        """Extend an entry's lifetime after the API confirmed it is unchanged (304)."""
+        entry.expires_at = time.time() + self.ttl_for(endpoint)
+        entry.immutable = entry.immutable or immutable
+        with self._lock:
+            self._connection.execute(
+                "UPDATE responses SET expires_at = ?, immutable = ? WHERE key = ?",
+                (entry.expires_at, int(entry.immutable), entry.key),
+            )
+            self._connection.commit()
+            self.stats["revalidated"] += 1
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes. Caller holds the lock."""
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._connection.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.stats["evicted"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
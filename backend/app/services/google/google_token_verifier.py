@@ -0,0 +1,159 @@
+# Verification of Google sign-in ID tokens with cached signing certs
+
+import base64
+import json
+import logging
+import re
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+import requests
+from google.auth import exceptions as google_exceptions
+from google.auth import jwt as google_jwt
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.core.metrics import dependency_span
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleCertsCache:
+    """
+    Google's ID token signing certs, kept in memory for as long as the certs endpoint's Cache-Control allows.
+    Refreshes are single-flight, concurrent logins wait for the one fetch instead of each fetching.
+    """
+
+    def __init__(
+        self,
+        certs_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        default_ttl: Optional[int] = None,
+        min_refresh_interval: Optional[float] = None,
+        session: Optional[requests.Session] = None,
+    ):
+        self.certs_url = certs_url or settings.google_certs_url
+        self.timeout = timeout or settings.google_certs_timeout
+        self.default_ttl = settings.google_certs_default_ttl if default_ttl is None else default_ttl
+        # Limits forced refreshes when tokens arrive signed with a key id we don't know
+        self.min_refresh_interval = (
+            settings.google_certs_min_refresh_interval if min_refresh_interval is None else min_refresh_interval
+        )
+        self.logger = logging.getLogger(__name__)
+        self._session = session or self._create_session()
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        # Last fetch attempt, successful or not, so an outage doesn't force a fetch per login
+        self._attempted_at = 0.0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "fetches": 0, "fetch_errors": 0}
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=1)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @staticmethod
+    def _ttl(headers: Mapping[str, str], default_ttl: int) -> int:
+        """Seconds the response may be reused for, from Cache-Control max-age minus Age."""
+        cache_control = headers.get("Cache-Control", "")
+        if "no-store" in cache_control or "no-cache" in cache_control:
+            return 0
+        match = _MAX_AGE.search(cache_control)
+        if match is None:
+            return default_ttl
+        try:
+            age = int(headers.get("Age", 0))
+        except ValueError:
+            age = 0
+        return max(int(match.group(1)) - age, 0)
+
+    def _fetch(self) -> None:
+        """Fetch the certs, keeping the previous ones if Google can't be reached."""
+        self.stats["fetches"] += 1
+        self._attempted_at = time.monotonic()
+        try:
+            with dependency_span("google", "certs"):
+                response = self._session.get(self.certs_url, timeout=self.timeout)
+                response.raise_for_status()
+                certs = response.json()
+        except (requests.RequestException, ValueError) as e:
+            self.stats["fetch_errors"] += 1
+            # Back off for the refresh interval rather than retrying on every login
+            self._expires_at = time.monotonic() + self.min_refresh_interval
+            if not self._certs:
+                raise google_exceptions.TransportError(f"Could not fetch Google certs: {e}")
+            self.logger.warning(f"Could not refresh Google certs, using the cached ones: {e}")
+            return
+
+        now = time.monotonic()
+        self._certs = certs
+        self._expires_at = now + self._ttl(response.headers, self.default_ttl)
+        self.logger.info(f"Fetched {len(certs)} Google certs, valid for {self._expires_at - now:.0f} seconds")
+
+    def get_certs(self, key_id: Optional[str] = None) -> Dict[str, str]:
+        """
+        Return the current certs, fetching them when expired or when key_id is unknown (key rotation).
+        """
+        with self._lock:
+            now = time.monotonic()
+            expired = now >= self._expires_at
+            unknown_key = (
+                key_id is not None
+                and key_id not in self._certs
+                and now - self._attempted_at >= self.min_refresh_interval
+            )
+            if expired or unknown_key:
+                self._fetch()
+            elif not self._certs:
+                # The first fetch failed and we are backing off
+                raise google_exceptions.TransportError("Google certs are unavailable")
+            else:
+                self.stats["hits"] += 1
+            return self._certs
+
+    def close(self) -> None:
+        self._session.close()
+
+
+class GoogleTokenVerifier:
+    """Verify Google ID tokens against cached certs, the same checks as id_token.verify_oauth2_token."""
+
+    def __init__(self, certs_cache: GoogleCertsCache, audience: Optional[str] = None, clock_skew_seconds: int = 10):
+        self.certs_cache = certs_cache
+        self.audience = audience or settings.client_id
+        self.clock_skew_seconds = clock_skew_seconds
+
+    @staticmethod
+    def _key_id(token: str) -> Optional[str]:
+        try:
+            header_segment = token.split(".", 1)[0]
+            header = json.loads(base64.urlsafe_b64decode(header_segment + "=" * (-len(header_segment) % 4)))
+            return header.get("kid") if isinstance(header, dict) else None
+        except ValueError:
+            return None
+
+    def verify(self, token: str) -> Dict:
+        """
+        Verify a Google ID token and return its claims.
+        Blocks on a certs fetch when the cache is cold, call it from a worker thread.
+        Raises:
+            ValueError: If the token is malformed, expired, badly signed or for another audience
+            google.auth.exceptions.GoogleAuthError: If the token is from another issuer, or (TransportError)
+                the certs can't be fetched and none are cached
+        """
+        certs = self.certs_cache.get_certs(self._key_id(token))
+        claims = google_jwt.decode(
+            token, certs=certs, audience=self.audience, clock_skew_in_seconds=self.clock_skew_seconds
+        )
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            raise google_exceptions.GoogleAuthError(
+                f"Wrong issuer. 'iss' should be one of the following: {GOOGLE_ISSUERS}"
+            )
+        return claims
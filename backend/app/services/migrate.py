@@ -0,0 +1,13 @@
+from app.services.database.schema_migrations import migrate
+import argparse
+import logging
+
+logging.basicConfig(level=logging.INFO)
+
+if __name__ == "__main__":
+    # Run once per deploy, before starting the API and Celery workers
+    parser = argparse.ArgumentParser(description="Create the database and upgrade its schema")
+    parser.add_argument("revision", nargs="?", default="head", help="target revision, defaults to head")
+    args = parser.parse_args()
+
+    migrate(args.revision)
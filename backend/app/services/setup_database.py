@@ -13,6 +13,8 @@ if __name__ == "__main__":
         # Sync data for 2025
         result = db_service.sync_year_data("2025")
         print(f"Sync completed: {result}")
+        print(f"F1 API connection stats: {f1_api.get_connection_stats()}")
+        print(f"F1 API cache stats: {f1_api.get_cache_stats()}")
         
     except Exception as e:
         print(f"Sync failed: {e}")
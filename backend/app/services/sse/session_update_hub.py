@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import re
+from typing import AsyncIterator, List, Optional, Set, Tuple
+
+import redis
+import redis.asyncio as aioredis
+from fastapi import Request
+
+from app.core.config import settings
+
+# (Redis stream entry id, data), the entry id is the SSE event id
+Event = Tuple[str, str]
+
+SESSION_UPDATES_STREAM = "session_updates"
+
+EVENT_ID_PATTERN = re.compile(r"^\d+-\d+$")
+
+
+def publish_session_update(
+    client: redis.Redis,
+    data: str,
+    stream_name: str = SESSION_UPDATES_STREAM,
+    max_length: int = settings.sse_replay_buffer_size,
+) -> str:
+    """
+    Append a session update to the Redis stream every API process reads.
+    Redis assigns the entry id, so all processes send the same event id and a client can
+    resume on any of them, also after a restart.
+    Returns:
+        The entry id
+    """
+    return client.xadd(stream_name, {"data": data}, maxlen=max_length, approximate=True)
+
+
+def _event_id_key(event_id: str) -> Tuple[int, int]:
+    milliseconds, sequence = event_id.split("-")
+    return int(milliseconds), int(sequence)
+
+
+class SessionUpdateHub:
+    """
+    Broadcasts session updates from a Redis stream to every connected SSE client.
+    Runs on the application's event loop: one async Redis reader feeds a bounded
+    queue per client. Slow clients lose their oldest events instead of blocking the others.
+    Reconnecting clients replay what they missed from the stream using Last-Event-ID,
+    the stream keeps the latest buffer_size events.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        stream_name: str = SESSION_UPDATES_STREAM,
+        queue_size: int = 100,
+        buffer_size: int = 256,
+        heartbeat_seconds: float = 15.0,
+    ):
+        self.redis_url = redis_url
+        self.stream_name = stream_name
+        self.queue_size = queue_size
+        self.buffer_size = buffer_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.logger = logging.getLogger(__name__)
+
+        self._clients: Set[asyncio.Queue] = set()
+        self._redis: Optional[aioredis.Redis] = None
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    async def start(self) -> None:
+        """Start the Redis stream reader on the running event loop."""
+        if self._listener is None:
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop the Redis stream reader."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _listen(self) -> None:
+        """Forward every new entry of the Redis stream to the clients, reconnecting on errors."""
+        last_id: Optional[str] = None
+        while True:
+            client = aioredis.from_url(self.redis_url, decode_responses=True)
+            try:
+                if last_id is None:
+                    # Start after the newest entry, older ones are only sent as replay
+                    latest = await client.xrevrange(self.stream_name, count=1)
+                    last_id = latest[0][0] if latest else "0-0"
+                while True:
+                    entries = await client.xread(
+                        {self.stream_name: last_id}, block=int(self.heartbeat_seconds * 1000)
+                    )
+                    for _, messages in entries:
+                        for entry_id, fields in messages:
+                            last_id = entry_id
+                            self.dispatch((entry_id, fields.get("data", "")))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Resumes after last_id, nothing published while reconnecting is lost
+                self.logger.error(f"Session update reader failed, reconnecting: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await client.aclose()
+
+    def dispatch(self, event: Event) -> None:
+        """Hand an event to every client queue."""
+        for queue in self._clients:
+            self._put_dropping_oldest(queue, event)
+
+    @staticmethod
+    def _put_dropping_oldest(queue: asyncio.Queue, event: Event) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    async def replay(self, last_event_id: Optional[str]) -> List[Event]:
+        """
+        Events of the stream published after last_event_id, oldest first.
+        Unknown or malformed ids replay nothing, a Redis error is logged and replays nothing.
+        """
+        if not last_event_id or not EVENT_ID_PATTERN.match(last_event_id) or self._redis is None:
+            return []
+        try:
+            entries = await self._redis.xrange(self.stream_name, min=f"({last_event_id}", count=self.buffer_size)
+        except redis.RedisError as e:
+            self.logger.error(f"Failed to replay session updates after {last_event_id}: {e}")
+            return []
+        return [(entry_id, fields.get("data", "")) for entry_id, fields in entries]
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a client for new events."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._clients.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._clients.discard(queue)
+
+    async def stream(self, request: Request, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Yield SSE frames for one client until it disconnects, sending heartbeat comments while idle.
+        Subscribes before replaying so nothing published meanwhile is missed, live events the
+        replay already sent are skipped.
+        """
+        queue = self.subscribe()
+        try:
+            sent_key: Optional[Tuple[int, int]] = None
+            for event_id, data in await self.replay(last_event_id):
+                sent_key = _event_id_key(event_id)
+                yield f"id: {event_id}\ndata: {data}\n\n"
+
+            while not await request.is_disconnected():
+                try:
+                    event_id, data = await asyncio.wait_for(queue.get(), timeout=self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if sent_key is not None and _event_id_key(event_id) <= sent_key:
+                    continue
+                yield f"id: {event_id}\ndata: {data}\n\n"
+        finally:
+            self.unsubscribe(queue)
+
+
+session_update_hub = SessionUpdateHub(
+    settings.redis_url,
+    queue_size=settings.sse_client_queue_size,
+    buffer_size=settings.sse_replay_buffer_size,
+    heartbeat_seconds=settings.sse_heartbeat_seconds,
+)
@@ -0,0 +1,11 @@
+from typing import Iterator, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[List[T]]:
+    """Split a sequence into lists of at most `size` items."""
+    if size <= 0:
+        size = len(items) or 1
+    for start in range(0, len(items), size):
+        yield list(items[start:start + size])
@@ -0,0 +1,61 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryCounter:
+    """Statements executed while a count_queries block was active."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def record(self, statement: str) -> None:
+        with self._lock:
+            self.statements.append(statement)
+
+    def report(self) -> str:
+        return "\n".join(f"{index + 1}. {statement}" for index, statement in enumerate(self.statements))
+
+
+@contextmanager
+def count_queries(engine: Optional[Union[Engine, AsyncEngine]] = None) -> Iterator[QueryCounter]:
+    """
+    Count the statements sent to the database, to catch N+1 regressions.
+    Listens on every engine (primary, async and replicas) unless one is given, so run it on its own
+    rather than next to concurrent traffic.
+    Args:
+        engine: Only count statements of this engine
+    """
+    target = engine.sync_engine if isinstance(engine, AsyncEngine) else engine or Engine
+    counter = QueryCounter()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.record(statement)
+
+    event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(target, "before_cursor_execute", before_cursor_execute)
+
+
+@contextmanager
+def assert_max_queries(limit: int, engine: Optional[Union[Engine, AsyncEngine]] = None) -> Iterator[QueryCounter]:
+    """
+    Fail when the block issues more than `limit` statements.
+    Raises:
+        AssertionError: Listing the statements that were executed
+    """
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > limit:
+        raise AssertionError(f"Expected at most {limit} statements, {counter.count} were executed:\n{counter.report()}")
@@ -0,0 +1,57 @@
+"""
+Per-request cost of access token verification, with and without the verified-token cache.
+
+Run it from the backend folder (reads .env like the application):
+
+    python -m benchmarks.auth_overhead --requests 100000 --clients 200
+"""
+import argparse
+import datetime
+import random
+import time
+
+from app.core.auth import TokenVerifier, VerifiedTokenCache
+from app.core.config import settings
+from app.core.dependencies import create_access_token
+
+
+def _run(verifier: TokenVerifier, tokens, requests: int) -> float:
+    """Average microseconds per verification for a random client on every request."""
+    picks = [random.choice(tokens) for _ in range(requests)]
+    started = time.perf_counter()
+    for token in picks:
+        verifier.verify(token)
+    return (time.perf_counter() - started) * 1_000_000 / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100_000, help="verifications per scenario")
+    parser.add_argument("--clients", type=int, default=200, help="distinct tokens polling concurrently")
+    args = parser.parse_args()
+
+    tokens = [
+        create_access_token(
+            {"name": f"user {client}", "email": f"user{client}@example.com"},
+            datetime.timedelta(minutes=60),
+        )
+        for client in range(args.clients)
+    ]
+
+    scenarios = {
+        "pyjwt, no cache (before)": TokenVerifier(settings.secret_key, "pyjwt"),
+        "hmac, no cache": TokenVerifier(settings.secret_key, "hmac"),
+        "pyjwt + cache": TokenVerifier(settings.secret_key, "pyjwt", VerifiedTokenCache()),
+        "hmac + cache": TokenVerifier(settings.secret_key, "hmac", VerifiedTokenCache()),
+    }
+    for name, verifier in scenarios.items():
+        per_request = _run(verifier, tokens, args.requests)
+        hit_rate = ""
+        if verifier.cache is not None:
+            stats = verifier.cache.stats
+            hit_rate = f", cache hit rate {stats['hits'] / (stats['hits'] + stats['misses']):.1%}"
+        print(f"{name:<28} {per_request:8.2f} us/request{hit_rate}")
+
+
+if __name__ == "__main__":
+    main()
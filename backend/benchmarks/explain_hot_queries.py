@@ -0,0 +1,71 @@
+"""
+Print the MySQL plan and timing of the hot lookup queries.
+
+Run it from the backend folder against a populated database, before and after `alembic upgrade head`:
+
+    python -m benchmarks.explain_hot_queries --repeat 50
+"""
+import argparse
+import time
+
+from sqlalchemy import text
+from sqlmodel import select
+
+from app.models.sql_models import Guess, RaceResult, User
+from app.services.database.connector import get_db_manager
+from app.services.database.race_result_service import RaceResultService
+from app.services.database.race_service import RaceService
+from app.services.database.user_service import UserService
+
+
+def _compile(session, statement) -> str:
+    return str(statement.compile(bind=session.get_bind(), compile_kwargs={"literal_binds": True}))
+
+
+def _hot_queries(session):
+    """Build the hot queries for a race that has both a result and a guess."""
+    result = session.exec(
+        select(RaceResult).join(Guess, Guess.race_id == RaceResult.race_id).limit(1)
+    ).first()
+    if result is None:
+        raise SystemExit("Need at least one race with a result and a guess to explain")
+    guess = session.exec(select(Guess).where(Guess.race_id == result.race_id).limit(1)).first()
+    email = session.exec(select(User.email).where(User.user_id == guess.user_id)).first()
+    driver_numbers = [result.position_1_driver_id, result.position_2_driver_id, result.position_3_driver_id]
+
+    queries = {
+        "get_race_page (latest 20)": RaceService._race_summaries_query(20),
+        "get_race_standing": RaceResultService._standings_query([result.race_id]),
+        "get_winning_guess": RaceResultService._winning_guess_query(result.race_id),
+        "get_race_details": RaceService._race_details_query(result.race_id),
+        "get_guess": UserService._guess_query(email, result.race_id),
+        "add_guess validation": UserService._guess_validation_query(email, result.race_id, driver_numbers),
+        "raceresult by race_id": select(RaceResult).where(RaceResult.race_id == result.race_id),
+    }
+    return {name: _compile(session, query) for name, query in queries.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="executions per query for the timing")
+    args = parser.parse_args()
+
+    with get_db_manager().get_session_context() as session:
+        for name, sql in _hot_queries(session).items():
+            print(f"=== {name}")
+            print(sql)
+            for row in session.execute(text(f"EXPLAIN {sql}")).mappings():
+                print(
+                    f"  table={row['table']} type={row['type']} key={row['key']} "
+                    f"rows={row['rows']} extra={row['Extra']}"
+                )
+
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                session.execute(text(sql)).all()
+            elapsed_ms = (time.perf_counter() - started) * 1000 / args.repeat
+            print(f"  avg {elapsed_ms:.3f} ms over {args.repeat} runs\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Local stand-in for Google's ID token certs endpoint, for tests and login storm load tests.
+
+Serves a freshly generated signing key at /oauth2/v1/certs with a Cache-Control header, and prints
+ID tokens signed with it. Point the backend at it with:
+
+    GOOGLE_CERTS_URL=http://127.0.0.1:8765/oauth2/v1/certs
+
+then run, from the backend folder:
+
+    python -m benchmarks.google_certs_stub --audience <CLIENT_ID> --tokens 5
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import rsa
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+
+KEY_ID = "local-stub-key"
+
+
+def make_id_token(signer: crypt.RSASigner, audience: str, email: str, lifetime: int = 3600) -> str:
+    now = int(time.time())
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": audience,
+        "sub": email,
+        "email": email,
+        "name": email.split("@")[0],
+        "iat": now,
+        "exp": now + lifetime,
+    }
+    return google_jwt.encode(signer, claims).decode()
+
+
+def make_handler(certs_body: bytes, max_age: int):
+    class CertsHandler(BaseHTTPRequestHandler):
+        requests_served = 0
+
+        def do_GET(self):
+            if self.path != "/oauth2/v1/certs":
+                self.send_error(404)
+                return
+            CertsHandler.requests_served += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Cache-Control", f"public, max-age={max_age}, must-revalidate, no-transform")
+            self.send_header("Content-Length", str(len(certs_body)))
+            self.end_headers()
+            self.wfile.write(certs_body)
+
+        def log_message(self, format, *args):
+            print(f"certs fetch #{CertsHandler.requests_served}: {format % args}")
+
+    return CertsHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audience", required=True, help="OAuth client id the tokens are issued for")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-age", type=int, default=300, help="Cache-Control max-age of the certs response")
+    parser.add_argument("--tokens", type=int, default=1, help="ID tokens to print, one per fake user")
+    args = parser.parse_args()
+
+    public_key, private_key = rsa.newkeys(2048)
+    signer = crypt.RSASigner.from_string(private_key.save_pkcs1().decode(), key_id=KEY_ID)
+    certs_body = json.dumps({KEY_ID: public_key.save_pkcs1().decode()}).encode()
+
+    for user in range(args.tokens):
+        print(make_id_token(signer, args.audience, f"stub-user-{user}@example.com"))
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(certs_body, args.max_age))
+    print(f"Serving certs on http://127.0.0.1:{args.port}/oauth2/v1/certs")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
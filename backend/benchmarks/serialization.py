@@ -0,0 +1,129 @@
+"""
+Per-route response serialization cost on season-sized payloads: FastAPI's default response_model path
+(validate, serialize, json.dumps) and the ModelJSONResponse fast path.
+
+Run it from the backend folder (reads .env like the application):
+
+    python -m benchmarks.serialization --repeat 200 --seasons 3
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.responses import ModelJSONResponse
+from app.models.pydantic_models import DriverPosition, LeaderboardPage, LeaderboardRow, RaceSummary, Standings
+from app.models.sql_models import Guess, RaceDriver
+
+DRIVERS_PER_SESSION = 20
+SESSIONS_PER_SEASON = 24 * 3
+
+
+def _payloads(seasons: int, users: int) -> Dict[str, Any]:
+    """Instances built the way they are read: table models without validation, pydantic models validated once."""
+    season_start = datetime(2025, 3, 1)
+    races = [
+        RaceSummary(
+            race_id=9000 + index,
+            race_name=f"Grand Prix {index // 3}",
+            race_type=("Qualifying", "Sprint", "Race")[index % 3],
+            race_date=season_start + timedelta(days=index * 2),
+        )
+        for index in range(SESSIONS_PER_SEASON * seasons)
+    ]
+    drivers = [
+        RaceDriver(
+            race_driver_id=index,
+            race_id=9158,
+            driver_number=index + 1,
+            driver_name=f"Driver Number {index + 1}",
+            team=f"Team {index // 2}",
+        )
+        for index in range(DRIVERS_PER_SESSION)
+    ]
+    standings = Standings(
+        session_key=9158,
+        standings=[
+            DriverPosition(position=position, driver_number=position, driver_name=f"Driver {position}")
+            for position in range(1, 4)
+        ],
+    )
+    leaderboard = LeaderboardPage(
+        season=2025,
+        page=1,
+        page_size=users,
+        total=users,
+        entries=[
+            LeaderboardRow(
+                rank=rank,
+                user_id=rank,
+                username=f"user{rank}",
+                points=1000 - rank,
+                exact_positions=rank % 40,
+                podium_positions=rank % 70,
+                races_scored=24,
+            )
+            for rank in range(1, users + 1)
+        ],
+    )
+    winner = Guess(
+        guess_id=1,
+        user_id=1,
+        race_id=9158,
+        position_1_driver_id=1,
+        position_2_driver_id=16,
+        position_3_driver_id=81,
+    )
+    return {
+        "/f1/sessions": (List[RaceSummary], races),
+        "/f1/session_drivers": (List[RaceDriver], drivers),
+        "/f1/session_standing": (Standings, standings),
+        "/results/leaderboard": (LeaderboardPage, leaderboard),
+        "/results/winners": (Optional[Guess], winner),
+    }
+
+
+async def _default_path(annotation: Any, content: Any) -> bytes:
+    field = create_model_field(name="Response", type_=annotation, mode="serialization")
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+def _time(render: Callable[[], Any], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    return (time.perf_counter() - started) * 1_000_000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="serializations per route and path")
+    parser.add_argument("--seasons", type=int, default=3, help="seasons of sessions in the /f1/sessions payload")
+    parser.add_argument("--users", type=int, default=200, help="rows in the leaderboard page")
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    print(f"{'route':<24}{'default':>12}{'fast path':>12}{'bytes':>10}")
+    for route, (annotation, content) in _payloads(args.seasons, args.users).items():
+        default = _time(lambda: loop.run_until_complete(_default_path(annotation, content)), args.repeat)
+        fast = _time(lambda: ModelJSONResponse(content, annotation).body, args.repeat)
+        size = len(ModelJSONResponse(content, annotation).body)
+        print(f"{route:<24}{default:>10.1f}us{fast:>10.1f}us{size:>10}")
+    loop.close()
+
+    # Same JSON either way, up to whitespace
+    annotation, content = _payloads(1, 10)["/f1/session_drivers"]
+    assert jsonable_encoder(content) == jsonable_encoder(
+        json.loads(ModelJSONResponse(content, annotation).body)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Baseline schema, as created by SQLModel.metadata.create_all before migrations
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user",
+        sa.Column("user_id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("username", sqlmodel.AutoString(length=50), nullable=False),
+        sa.Column("email", sqlmodel.AutoString(length=100), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "email"),
+        sa.UniqueConstraint("email"),
+    )
+    op.create_table(
+        "race",
+        sa.Column("race_id", sa.Integer(), nullable=False),
+        sa.Column("race_name", sqlmodel.AutoString(length=100), nullable=False),
+        sa.Column("race_type", sqlmodel.AutoString(length=100), nullable=False),
+        sa.Column("race_date", sqlmodel.AutoString(), nullable=False),
+        sa.PrimaryKeyConstraint("race_id"),
+    )
+    op.create_table(
+        "racedriver",
+        sa.Column("race_id", sa.Integer(), nullable=True),
+        sa.Column("race_driver_id", sa.Integer(), nullable=False),
+        sa.Column("driver_number", sa.Integer(), nullable=False),
+        sa.Column("driver_name", sqlmodel.AutoString(length=100), nullable=False),
+        sa.Column("team", sqlmodel.AutoString(length=50), nullable=True),
+        sa.ForeignKeyConstraint(["race_id"], ["race.race_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("race_driver_id"),
+    )
+    op.create_table(
+        "raceresult",
+        sa.Column("race_id", sa.Integer(), nullable=True),
+        sa.Column("race_result_id", sa.Integer(), nullable=False),
+        sa.Column("position_1_driver_id", sa.Integer(), nullable=False),
+        sa.Column("position_2_driver_id", sa.Integer(), nullable=False),
+        sa.Column("position_3_driver_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["race_id"], ["race.race_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("race_result_id"),
+    )
+    op.create_table(
+        "guess",
+        sa.Column("user_id", sa.String(length=100), nullable=False),
+        sa.Column("race_id", sa.Integer(), nullable=True),
+        sa.Column("position_1_driver_id", sa.Integer(), nullable=True),
+        sa.Column("position_2_driver_id", sa.Integer(), nullable=True),
+        sa.Column("position_3_driver_id", sa.Integer(), nullable=True),
+        sa.Column("guess_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["position_1_driver_id"], ["racedriver.race_driver_id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["position_2_driver_id"], ["racedriver.race_driver_id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["position_3_driver_id"], ["racedriver.race_driver_id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["race_id"], ["race.race_id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["user.user_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("guess_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("guess")
+    op.drop_table("raceresult")
+    op.drop_table("racedriver")
+    op.drop_table("race")
+    op.drop_table("user")
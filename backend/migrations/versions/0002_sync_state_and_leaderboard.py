@@ -0,0 +1,68 @@
+"""Sync progress and leaderboard tables
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # These tables may already exist on databases bootstrapped with create_all
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "syncstate" not in existing:
+        op.create_table(
+            "syncstate",
+            sa.Column("race_id", sa.Integer(), nullable=False),
+            sa.Column("session_start", sa.DateTime(), nullable=True),
+            sa.Column("session_end", sa.DateTime(), nullable=True),
+            sa.Column("drivers_synced", sa.Boolean(), nullable=False),
+            sa.Column("results_synced", sa.Boolean(), nullable=False),
+            sa.Column("last_synced_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["race_id"], ["race.race_id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("race_id"),
+        )
+    if "guessscore" not in existing:
+        op.create_table(
+            "guessscore",
+            sa.Column("guess_id", sa.Integer(), nullable=False),
+            sa.Column("race_id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("season", sa.Integer(), nullable=False),
+            sa.Column("points", sa.Integer(), nullable=False),
+            sa.Column("exact_positions", sa.Integer(), nullable=False),
+            sa.Column("podium_positions", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["guess_id"], ["guess.guess_id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("guess_id"),
+        )
+        op.create_index("ix_guessscore_race_id", "guessscore", ["race_id"])
+    if "leaderboardentry" not in existing:
+        op.create_table(
+            "leaderboardentry",
+            sa.Column("season", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("points", sa.Integer(), nullable=False),
+            sa.Column("exact_positions", sa.Integer(), nullable=False),
+            sa.Column("podium_positions", sa.Integer(), nullable=False),
+            sa.Column("races_scored", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["user.user_id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("season", "user_id"),
+        )
+        op.create_index(
+            "ix_leaderboardentry_season_points", "leaderboardentry", ["season", "points"]
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("leaderboardentry")
+    op.drop_table("guessscore")
+    op.drop_table("syncstate")
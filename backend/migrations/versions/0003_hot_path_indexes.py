@@ -0,0 +1,158 @@
+"""Indexes and unique keys for the hot lookup paths, race_date as DATETIME
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from typing import List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UNIQUE_KEYS = [
+    ("racedriver", "uq_racedriver_race_driver_number", ["race_id", "driver_number"]),
+    ("guess", "uq_guess_user_race", ["user_id", "race_id"]),
+    ("raceresult", "uq_raceresult_race_id", ["race_id"]),
+]
+
+INDEXES = [
+    ("race", "ix_race_race_date_race_id", ["race_date", "race_id"]),
+    (
+        "guess",
+        "ix_guess_race_positions",
+        ["race_id", "position_1_driver_id", "position_2_driver_id", "position_3_driver_id"],
+    ),
+    ("syncstate", "ix_syncstate_results_pending", ["results_synced", "session_start"]),
+    ("syncstate", "ix_syncstate_session_window", ["session_start", "session_end"]),
+]
+
+FOREIGN_KEY_COLUMNS = [
+    ("racedriver", "race_id"),
+    ("guess", "user_id"),
+    ("guess", "race_id"),
+    ("raceresult", "race_id"),
+]
+
+
+def _has_key(inspector, table: str, columns: List[str], unique: bool) -> bool:
+    """Check for an existing key over exactly these columns, whatever its name."""
+    keys = [
+        (index["column_names"], bool(index.get("unique")))
+        for index in inspector.get_indexes(table)
+    ]
+    keys += [
+        (constraint["column_names"], True)
+        for constraint in inspector.get_unique_constraints(table)
+    ]
+    return any(
+        key_columns == columns and (is_unique or not unique)
+        for key_columns, is_unique in keys
+    )
+
+
+def _remove_duplicates() -> None:
+    # Keep the latest guess per user and race, it's the one the upsert would have kept
+    op.execute(
+        """
+        DELETE older FROM guess AS older
+        JOIN guess AS newer
+          ON newer.user_id = older.user_id
+         AND newer.race_id = older.race_id
+         AND newer.guess_id > older.guess_id
+        """
+    )
+    op.execute(
+        """
+        DELETE older FROM raceresult AS older
+        JOIN raceresult AS newer
+          ON newer.race_id = older.race_id
+         AND newer.race_result_id > older.race_result_id
+        """
+    )
+
+    # Deleting race drivers would cascade into guesses, so leave that decision to a person
+    duplicate_drivers = op.get_bind().execute(
+        sa.text(
+            """
+            SELECT race_id, driver_number, COUNT(*) AS copies
+            FROM racedriver
+            GROUP BY race_id, driver_number
+            HAVING COUNT(*) > 1
+            """
+        )
+    ).fetchall()
+    if duplicate_drivers:
+        raise RuntimeError(
+            f"racedriver has {len(duplicate_drivers)} duplicated (race_id, driver_number) pairs, "
+            f"e.g. {tuple(duplicate_drivers[0])}; remove them before upgrading"
+        )
+
+
+def upgrade() -> None:
+    _remove_duplicates()
+
+    # Convert the ISO strings from the F1 open API ("2024-03-02T15:00:00+00:00") to naive UTC
+    op.execute(
+        """
+        UPDATE race
+        SET race_date = DATE_FORMAT(
+            STR_TO_DATE(LEFT(race_date, 19), '%Y-%m-%dT%H:%i:%s'), '%Y-%m-%d %H:%i:%s'
+        )
+        WHERE race_date LIKE '____-__-__T%'
+        """
+    )
+    op.alter_column(
+        "race",
+        "race_date",
+        existing_type=sa.String(length=255),
+        type_=sa.DateTime(),
+        existing_nullable=False,
+    )
+
+    inspector = sa.inspect(op.get_bind())
+    for table, name, columns in UNIQUE_KEYS:
+        if not _has_key(inspector, table, columns, unique=True):
+            op.create_unique_constraint(name, table, columns)
+    for table, name, columns in INDEXES:
+        if not _has_key(inspector, table, columns, unique=False):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    # MySQL may have folded the foreign key indexes into the keys below, give them their own back
+    for table, column in FOREIGN_KEY_COLUMNS:
+        if not _has_key(inspector, table, [column], unique=False):
+            op.create_index(f"ix_{table}_{column}", table, [column])
+
+    existing = {
+        (table, index["name"])
+        for table in {table for table, _, _ in INDEXES + UNIQUE_KEYS}
+        for index in inspector.get_indexes(table)
+    }
+    for table, name, _ in INDEXES:
+        if (table, name) in existing:
+            op.drop_index(name, table_name=table)
+    for table, name, _ in UNIQUE_KEYS:
+        if (table, name) in existing:
+            op.drop_constraint(name, table, type_="unique")
+
+    op.alter_column(
+        "race",
+        "race_date",
+        existing_type=sa.DateTime(),
+        type_=sa.String(length=255),
+        existing_nullable=False,
+    )
+    op.execute(
+        """
+        UPDATE race
+        SET race_date = CONCAT(REPLACE(race_date, ' ', 'T'), '+00:00')
+        """
+    )
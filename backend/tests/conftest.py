@@ -0,0 +1,183 @@
+import os
+
+# Settings are read on import, the tests never reach MySQL, Redis or the F1 open API
+for name, value in {
+    "CLIENT_ID": "test-client-id",
+    "CLIENT_SECRET": "test-client-secret",
+    "MYSQL_USER": "test",
+    "MYSQL_PASSWORD": "test",
+    "HOST_NAME": "localhost",
+    "DATABASE_NAME": "f1_application_test",
+    "CELERY_BROKER_URL": "memory://",
+    "CELERY_RESULT_BACKEND": "cache+memory://",
+    "SECRET_KEY": "test-secret-key-of-at-least-32-bytes",
+    "DISCORD_HOOK": "http://localhost/discord",
+    "RESPONSE_CACHE_BACKEND": "off",
+    "F1_CACHE_DIR": "",
+    "DB_SCHEMA_CHECK": "false",
+}.items():
+    os.environ.setdefault(name, value)
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import redis
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.app_base import Application
+from app.core.dependencies import (
+    create_access_token,
+    get_db_session,
+    get_async_db_session,
+    get_async_read_db_session,
+    get_leaderboard_service,
+    get_race_driver_service,
+    get_race_result_service,
+    get_race_service,
+    get_standings_cache,
+    get_user_service,
+)
+from app.models.sql_models import Guess, LeaderboardEntry, Race, RaceDriver, RaceResult, SyncState, User
+from app.services.cache.standings_cache import StandingsCache
+from app.services.database.leaderboard_service import LeaderboardService
+from app.services.database.race_driver_service import RaceDriverService
+from app.services.database.race_result_service import RaceResultService
+from app.services.database.race_service import RaceService
+from app.services.database.user_service import UserService
+
+SEASON = 2025
+EMAIL = "driver.fan@example.com"
+DRIVER_NUMBERS = [1, 4, 5, 10, 12, 14, 16, 18, 22, 23, 27, 30, 31, 43, 44, 55, 63, 81, 87, 6]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    return tmp_path / "f1.sqlite"
+
+
+@pytest.fixture
+async def engine(database_path):
+    """SQLite database with the application's tables, shared by every session of a test."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def sync_engine(engine, database_path):
+    """Synchronous engine on the same database, for the plain def routes."""
+    sync_engine = create_engine(f"sqlite:///{database_path}", poolclass=StaticPool)
+    yield sync_engine
+    sync_engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+async def season(session_factory):
+    """
+    A season of sessions, each with 20 drivers and a result, and one user who guessed every podium.
+    Returns the session keys, newest last.
+    """
+    session_keys = list(range(9150, 9160))
+    rows = [User(user_id=1, username="fan", email=EMAIL)]
+    for index, session_key in enumerate(session_keys):
+        rows.append(
+            Race(
+                race_id=session_key,
+                race_name=f"Grand Prix {index}",
+                race_type="Race",
+                race_date=datetime(SEASON, 3, 2) + timedelta(days=7 * index),
+            )
+        )
+        rows.append(SyncState(race_id=session_key, last_synced_at=datetime(SEASON, 11, 1)))
+        rows.extend(
+            RaceDriver(
+                race_id=session_key,
+                driver_number=driver_number,
+                driver_name=f"Driver {driver_number}",
+                team=f"Team {position // 2}",
+            )
+            for position, driver_number in enumerate(DRIVER_NUMBERS)
+        )
+        podium = DRIVER_NUMBERS[index % 3:index % 3 + 3]
+        rows.append(
+            RaceResult(
+                race_id=session_key,
+                position_1_driver_id=podium[0],
+                position_2_driver_id=podium[1],
+                position_3_driver_id=podium[2],
+            )
+        )
+        rows.append(
+            Guess(
+                user_id=1,
+                race_id=session_key,
+                position_1_driver_id=podium[0],
+                position_2_driver_id=podium[1],
+                position_3_driver_id=podium[2],
+            )
+        )
+    rows.append(LeaderboardEntry(season=SEASON, user_id=1, points=110, exact_positions=30, races_scored=10))
+
+    async with session_factory() as session:
+        session.add_all(rows)
+        await session.commit()
+    return SimpleNamespace(year=SEASON, email=EMAIL, session_keys=session_keys)
+
+
+@pytest.fixture
+def app(session_factory, sync_engine):
+    """The API with its database sessions on the SQLite fixture and the Redis caches left out."""
+    application = Application(title="F1 Mexicorn tests")
+
+    async def get_test_session():
+        async with session_factory() as session:
+            yield session
+
+    def get_sync_test_session():
+        with Session(sync_engine) as session:
+            yield session
+
+    race_driver_service = RaceDriverService()
+    application.dependency_overrides.update(
+        {
+            get_db_session: get_sync_test_session,
+            get_async_db_session: get_test_session,
+            get_async_read_db_session: get_test_session,
+            # No async Redis client, so every standings request is built from the database
+            get_standings_cache: lambda: StandingsCache(redis.Redis()),
+            get_race_service: RaceService,
+            get_race_driver_service: lambda: race_driver_service,
+            get_race_result_service: RaceResultService,
+            get_user_service: lambda: UserService(race_driver_service),
+            get_leaderboard_service: LeaderboardService,
+        }
+    )
+    return application
+
+
+@pytest.fixture
+async def client(app, season):
+    token = create_access_token({"email": season.email})
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://testserver",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        yield client
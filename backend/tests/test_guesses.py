@@ -0,0 +1,45 @@
+"""
+Validation of posted guesses, every rejection is a 400 before anything is written.
+"""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def podium_guess(race_id, first, second, third):
+    return {
+        "race_id": race_id,
+        "position_1_driver_id": first,
+        "position_2_driver_id": second,
+        "position_3_driver_id": third,
+    }
+
+
+@pytest.mark.parametrize("podium", [(44, 44, 44), (44, 1, 44), (1, 4, 4)])
+async def test_guess_with_repeated_driver_is_rejected(client, season, podium):
+    response = await client.post("/f1/guess", json=podium_guess(season.session_keys[0], *podium))
+
+    assert response.status_code == 400
+    assert "three different drivers" in response.json()["detail"]
+
+
+async def test_guess_with_driver_outside_the_race_is_rejected(client, season):
+    response = await client.post("/f1/guess", json=podium_guess(season.session_keys[0], 1, 4, 99))
+
+    assert response.status_code == 400
+    assert "race and drivers don't match" in response.json()["detail"]
+
+
+async def test_guess_for_unknown_race_is_rejected(client, season):
+    response = await client.post("/f1/guess", json=podium_guess(1, 1, 4, 5))
+
+    assert response.status_code == 400
+    assert "race does not exist" in response.json()["detail"]
+
+
+async def test_guess_for_started_race_is_rejected(client, season):
+    response = await client.post("/f1/guess", json=podium_guess(season.session_keys[0], 1, 4, 5))
+
+    assert response.status_code == 400
+    assert "already STARTED or FINISHED" in response.json()["detail"]
@@ -0,0 +1,39 @@
+"""
+/metrics is only served to scrapers holding the metrics token.
+"""
+
+import httpx
+import pytest
+
+from app.core.app_base import Application
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+
+async def get_metrics(metrics_token, monkeypatch, headers=None):
+    monkeypatch.setattr(settings, "metrics_token", metrics_token)
+    transport = httpx.ASGITransport(app=Application(title="F1 Mexicorn tests"))
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        return await client.get("/metrics", headers=headers)
+
+
+async def test_metrics_are_not_mounted_without_a_token(monkeypatch):
+    response = await get_metrics("", monkeypatch)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("headers", [None, {"Authorization": "Bearer wrong"}, {"Authorization": "scrape-token"}])
+async def test_metrics_require_the_token(monkeypatch, headers):
+    response = await get_metrics("scrape-token", monkeypatch, headers)
+
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+
+
+async def test_metrics_are_served_with_the_token(monkeypatch):
+    response = await get_metrics("scrape-token", monkeypatch, {"Authorization": "Bearer scrape-token"})
+
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text
@@ -0,0 +1,82 @@
+"""
+Statement budgets of the read endpoints and services, an N+1 regression fails here.
+"""
+
+import pytest
+
+from app.services.database.race_result_service import RaceResultService
+from app.services.database.race_service import RaceService
+from app.utils.query_counter import assert_max_queries, count_queries
+
+pytestmark = pytest.mark.anyio
+
+# Endpoint -> most statements it may issue, {race}/{other}/{year} are filled from the season fixture
+ENDPOINT_BUDGETS = {
+    "/f1/sessions?limit=5": 1,
+    "/f1/session_drivers?session_id={race}": 1,
+    "/f1/guess/{race}": 1,
+    "/f1/session_standing?session_key={race}": 1,
+    "/f1/session_batch?session_keys={race}&session_keys={other}": 3,
+    "/results/winners?session_key={race}": 1,
+    "/results/leaderboard?season={year}": 2,
+}
+
+
+@pytest.mark.parametrize("path, budget", ENDPOINT_BUDGETS.items(), ids=list(ENDPOINT_BUDGETS))
+async def test_endpoint_statement_budget(client, engine, season, path, budget):
+    path = path.format(race=season.session_keys[-1], other=season.session_keys[0], year=season.year)
+
+    with assert_max_queries(budget, engine):
+        response = await client.get(path)
+
+    assert response.status_code == 200, response.text
+
+
+async def test_session_batch_statements_do_not_grow_with_sessions(client, engine, season):
+    with count_queries(engine) as one_session:
+        response = await client.get("/f1/session_batch", params={"session_keys": season.session_keys[:1]})
+    assert response.status_code == 200
+
+    with count_queries(engine) as whole_season:
+        response = await client.get("/f1/session_batch", params={"session_keys": season.session_keys})
+    assert response.status_code == 200
+
+    sessions = response.json()
+    assert [details["session_key"] for details in sessions] == season.session_keys
+    assert all(len(details["drivers"]) == 20 for details in sessions)
+    assert all(details["guess"] is not None for details in sessions)
+    assert all(len(details["standings"]) == 3 for details in sessions)
+    assert whole_season.count == one_session.count
+
+
+async def test_race_standing_is_resolved_in_one_statement(session_factory, engine, season):
+    async with session_factory() as session:
+        with assert_max_queries(1, engine):
+            standing = await RaceResultService().get_race_standing_async(session, season.session_keys[0])
+
+    assert [position.position for position in standing] == [1, 2, 3]
+    assert [position.driver_name for position in standing] == ["Driver 1", "Driver 4", "Driver 5"]
+
+
+async def test_race_standing_without_result_is_empty(session_factory, engine, season):
+    async with session_factory() as session:
+        with assert_max_queries(1, engine):
+            assert await RaceResultService().get_race_standing_async(session, 1) == []
+
+
+async def test_race_details_loads_drivers_and_result_in_one_statement(session_factory, engine, season):
+    async with session_factory() as session:
+        with assert_max_queries(1, engine):
+            race = await RaceService().get_race_details_async(session, season.session_keys[0])
+            # Loaded with the race, touching them must not issue (or, on an AsyncSession, fail) a lazy load
+            drivers, results = race.race_drivers, race.race_result
+
+    assert len(drivers) == 20
+    assert [result.position_1_driver_id for result in results] == [1]
+
+
+async def test_assert_max_queries_lists_the_statements_over_budget(session_factory, engine, season):
+    async with session_factory() as session:
+        with pytest.raises(AssertionError, match="Expected at most 0 statements, 1 were executed"):
+            with assert_max_queries(0, engine):
+                await RaceService().get_race_details_async(session, season.session_keys[0])
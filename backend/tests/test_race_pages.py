@@ -0,0 +1,103 @@
+"""
+/f1/sessions: keyset pages newest first, and conditional GETs answered with 304.
+"""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def read_all_pages(client, **params):
+    pages, cursor = [], None
+    while True:
+        response = await client.get("/f1/sessions", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        pages.append([race["race_id"] for race in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+async def test_cursor_walks_every_race_once_newest_first(client, season):
+    pages = await read_all_pages(client, limit=4)
+
+    newest_first = season.session_keys[::-1]
+    assert pages == [newest_first[:4], newest_first[4:8], newest_first[8:]]
+
+
+async def test_full_last_page_is_followed_by_an_empty_page(client, season):
+    pages = await read_all_pages(client, limit=5)
+
+    newest_first = season.session_keys[::-1]
+    assert pages == [newest_first[:5], newest_first[5:], []]
+
+
+async def test_without_limit_every_race_is_returned_without_cursor(client, season):
+    response = await client.get("/f1/sessions")
+
+    assert response.status_code == 200
+    assert [race["race_id"] for race in response.json()] == season.session_keys[::-1]
+    assert "X-Next-Cursor" not in response.headers
+
+
+async def test_invalid_cursor_is_a_bad_request(client, season):
+    response = await client.get("/f1/sessions", params={"limit": 4, "cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert "Invalid cursor" in response.json()["detail"]
+
+
+async def test_filters_by_season_and_session_type(client, season):
+    response = await client.get("/f1/sessions", params={"year": season.year, "session_type": "Race"})
+    assert len(response.json()) == len(season.session_keys)
+
+    response = await client.get("/f1/sessions", params={"year": season.year - 1})
+    assert response.status_code == 404
+
+    response = await client.get("/f1/sessions", params={"session_type": "Sprint"})
+    assert response.status_code == 404
+
+
+async def test_matching_etag_is_not_modified(client, season):
+    response = await client.get("/f1/sessions", params={"limit": 4})
+    etag = response.headers["ETag"]
+
+    revalidated = await client.get("/f1/sessions", params={"limit": 4}, headers={"If-None-Match": etag})
+
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.headers["X-Next-Cursor"] == response.headers["X-Next-Cursor"]
+
+
+async def test_other_etag_is_sent_again(client, season):
+    response = await client.get("/f1/sessions", params={"limit": 4}, headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 4
+
+
+@pytest.mark.parametrize(
+    "if_modified_since, status_code",
+    [
+        # last_synced_at of the season fixture is 2025-11-01 00:00 UTC
+        ("Sat, 01 Nov 2025 00:00:00 GMT", 304),
+        ("Sat, 01 Nov 2025 00:00:00 -0000", 304),
+        ("Fri, 31 Oct 2025 23:59:59 GMT", 200),
+        ("not a date", 200),
+    ],
+)
+async def test_if_modified_since(client, season, if_modified_since, status_code):
+    response = await client.get("/f1/sessions", headers={"If-Modified-Since": if_modified_since})
+
+    assert response.status_code == status_code
+    assert response.headers["Last-Modified"] == "Sat, 01 Nov 2025 00:00:00 GMT"
+
+
+async def test_etag_takes_precedence_over_if_modified_since(client, season):
+    response = await client.get(
+        "/f1/sessions",
+        headers={"If-None-Match": '"stale"', "If-Modified-Since": "Sat, 01 Nov 2025 00:00:00 GMT"},
+    )
+
+    assert response.status_code == 200
@@ -0,0 +1,80 @@
+"""
+Cached responses of the immutable read routes, served without the database until the sync invalidates their tag.
+"""
+
+import fakeredis
+import pytest
+
+from app.core import app_base
+from app.services.cache.http_response_cache import SESSIONS_TAG, HttpResponseCache, race_tag
+from app.utils.query_counter import assert_max_queries
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def response_cache(monkeypatch):
+    server = fakeredis.FakeServer()
+    cache = HttpResponseCache(fakeredis.FakeRedis(server=server), fakeredis.FakeAsyncRedis(server=server))
+    monkeypatch.setattr(app_base, "get_http_response_cache", lambda: cache)
+    return cache
+
+
+@pytest.fixture
+def app(response_cache, app):
+    return app
+
+
+async def get_drivers(client, session_key, **kwargs):
+    return await client.get("/f1/session_drivers", params={"session_id": session_key}, **kwargs)
+
+
+async def test_second_request_is_served_without_the_database(client, engine, season, response_cache):
+    first = await get_drivers(client, season.session_keys[0])
+
+    with assert_max_queries(0, engine):
+        second = await get_drivers(client, season.session_keys[0])
+
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+
+async def test_invalidated_race_is_rendered_again(client, season, response_cache):
+    invalidated, untouched = season.session_keys[:2]
+    await get_drivers(client, invalidated)
+    await get_drivers(client, untouched)
+
+    response_cache.invalidate([race_tag(invalidated)])
+
+    assert (await get_drivers(client, invalidated)).headers["X-Cache"] == "MISS"
+    assert (await get_drivers(client, untouched)).headers["X-Cache"] == "HIT"
+
+
+async def test_sessions_listing_is_invalidated_by_its_tag(client, season, response_cache):
+    await client.get("/f1/sessions", params={"limit": 4})
+    assert (await client.get("/f1/sessions", params={"limit": 4})).headers["X-Cache"] == "HIT"
+
+    response_cache.invalidate([SESSIONS_TAG])
+
+    response = await client.get("/f1/sessions", params={"limit": 4})
+    assert response.headers["X-Cache"] == "MISS"
+    assert "X-Next-Cursor" in response.headers
+
+
+async def test_cache_hit_revalidates_with_304(client, season, response_cache):
+    etag = (await get_drivers(client, season.session_keys[0])).headers["ETag"]
+
+    response = await get_drivers(client, season.session_keys[0], headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["X-Cache"] == "HIT"
+
+
+async def test_unauthenticated_request_is_not_served_from_the_cache(client, season, response_cache):
+    await get_drivers(client, season.session_keys[0])
+
+    response = await get_drivers(client, season.session_keys[0], headers={"Authorization": "Bearer invalid"})
+
+    assert response.status_code == 401
+    assert "X-Cache" not in response.headers
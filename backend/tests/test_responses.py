@@ -0,0 +1,43 @@
+"""
+JSON bodies of the routes on the ModelJSONResponse fast path match FastAPI's default response_model path.
+"""
+
+import pytest
+
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(params=[True, False], ids=["fast_json", "response_model"])
+def fast_json_responses(request, monkeypatch):
+    monkeypatch.setattr(settings, "fast_json_responses", request.param)
+    return request.param
+
+
+async def test_guess_user_id_is_an_integer(client, season, fast_json_responses):
+    response = await client.get(f"/f1/guess/{season.session_keys[0]}")
+
+    assert response.status_code == 200, response.text
+    assert response.json()["user_id"] == 1
+
+
+async def test_winning_guess_user_id_is_an_integer(client, season, fast_json_responses):
+    response = await client.get("/results/winners", params={"session_key": season.session_keys[0]})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["user_id"] == 1
+
+
+async def test_session_batch_guess_user_id_is_an_integer(client, season, fast_json_responses):
+    response = await client.get("/f1/session_batch", params={"session_keys": season.session_keys[:2]})
+
+    assert response.status_code == 200, response.text
+    assert [details["guess"]["user_id"] for details in response.json()] == [1, 1]
+
+
+async def test_race_date_keeps_its_utc_offset(client, season, fast_json_responses):
+    response = await client.get("/f1/sessions", params={"limit": 1})
+
+    assert response.status_code == 200, response.text
+    assert response.json()[0]["race_date"].endswith("+00:00")
@@ -0,0 +1,70 @@
+"""
+Roster cache tiers: Redis is shared by every process, local entries expire so an invalidation reaches them too.
+"""
+
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.services.cache.roster_cache import RosterCache
+
+pytestmark = pytest.mark.anyio
+
+ROSTER = {1: (101, "Driver 1", "Team 0"), 4: (102, "Driver 4", "Team 0")}
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+def roster_cache(redis_server, **kwargs):
+    """A process's roster cache on the shared Redis."""
+    return RosterCache(
+        redis_client=fakeredis.FakeRedis(server=redis_server),
+        async_redis_client=fakeredis.FakeAsyncRedis(server=redis_server),
+        **kwargs,
+    )
+
+
+async def test_roster_cached_by_one_process_is_read_by_another(redis_server):
+    writer, reader = roster_cache(redis_server), roster_cache(redis_server)
+
+    await writer.put_async(9150, ROSTER)
+
+    assert await reader.get_async(9150) == ROSTER
+    assert await reader.get_async(9150) == ROSTER
+    assert reader.stats == {"hits": 1, "redis_hits": 1, "misses": 0, "invalidations": 0}
+
+
+async def test_empty_roster_is_not_cached(redis_server):
+    cache = roster_cache(redis_server)
+
+    await cache.put_async(9150, {})
+
+    assert await cache.get_async(9150) is None
+    assert cache.stats["misses"] == 1
+
+
+async def test_invalidation_reaches_other_processes_after_the_local_ttl(redis_server):
+    api = roster_cache(redis_server, local_ttl_seconds=0.05)
+    sync_worker = roster_cache(redis_server)
+    await api.put_async(9150, ROSTER)
+
+    sync_worker.invalidate([9150])
+
+    # Still served locally until the entry expires, then the invalidated Redis tier misses
+    assert await api.get_async(9150) == ROSTER
+    await asyncio.sleep(0.1)
+    assert await api.get_async(9150) is None
+    assert sync_worker.stats["invalidations"] == 1
+
+
+async def test_invalidation_drops_the_local_entry_of_its_own_process(redis_server):
+    cache = roster_cache(redis_server)
+    await cache.put_async(9150, ROSTER)
+
+    cache.invalidate([9150])
+
+    assert cache.get(9150) is None
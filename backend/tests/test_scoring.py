@@ -0,0 +1,38 @@
+"""
+Points of a guess against the actual podium.
+"""
+
+import pytest
+
+from app.services.database.leaderboard_service import PointsScheme
+
+SCHEME = PointsScheme(exact_position=3, podium_position=1, perfect_podium_bonus=2)
+ACTUAL = (1, 44, 16)
+
+
+@pytest.mark.parametrize(
+    "guessed, expected",
+    [
+        ((1, 44, 16), (11, 3, 0)),
+        ((44, 16, 1), (3, 0, 3)),
+        ((1, 16, 44), (5, 1, 2)),
+        ((1, 44, 4), (6, 2, 0)),
+        ((4, 5, 10), (0, 0, 0)),
+        ((16, 5, 10), (1, 0, 1)),
+    ],
+)
+def test_score(guessed, expected):
+    assert SCHEME.score(guessed, ACTUAL) == expected
+
+
+@pytest.mark.parametrize(
+    "guessed, expected",
+    [
+        ((44, 44, 44), (3, 1, 0)),
+        ((16, 16, 16), (3, 1, 0)),
+        ((44, 1, 44), (2, 0, 2)),
+        ((4, 16, 16), (3, 1, 0)),
+    ],
+)
+def test_repeated_pick_scores_its_driver_once(guessed, expected):
+    assert SCHEME.score(guessed, ACTUAL) == expected
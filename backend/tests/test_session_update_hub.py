@@ -0,0 +1,105 @@
+"""
+SSE event ids are the Redis stream entry ids, so every API process sends and replays the same ids.
+"""
+
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.services.sse import session_update_hub as hub_module
+from app.services.sse.session_update_hub import SessionUpdateHub, publish_session_update
+
+pytestmark = pytest.mark.anyio
+
+
+class ConnectedRequest:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        hub_module.aioredis, "from_url", lambda url, **kwargs: fakeredis.FakeAsyncRedis(server=server, **kwargs)
+    )
+    return server
+
+
+@pytest.fixture
+def publish(redis_server):
+    client = fakeredis.FakeRedis(server=redis_server, decode_responses=True)
+    return lambda data: publish_session_update(client, data)
+
+
+@pytest.fixture
+async def hubs(redis_server):
+    """Two hubs on the same Redis, like two uvicorn workers."""
+    workers = [SessionUpdateHub("redis://test", heartbeat_seconds=0.05) for _ in range(2)]
+    for hub in workers:
+        await hub.start()
+    yield workers
+    for hub in workers:
+        await hub.stop()
+
+
+async def read_frames(hub, count, last_event_id=None):
+    frames = []
+    async for frame in hub.stream(ConnectedRequest(), last_event_id):
+        if not frame.startswith(":"):
+            frames.append(frame)
+        if len(frames) == count:
+            return frames
+    return frames
+
+
+async def test_every_worker_sends_the_publisher_event_id(hubs, publish):
+    readers = [asyncio.create_task(read_frames(hub, 2)) for hub in hubs]
+    await asyncio.sleep(0.1)
+
+    ids = [publish("first"), publish("second")]
+    frames = await asyncio.wait_for(asyncio.gather(*readers), timeout=5)
+
+    expected = [f"id: {event_id}\ndata: {data}\n\n" for event_id, data in zip(ids, ["first", "second"])]
+    assert frames == [expected, expected]
+
+
+async def test_reconnecting_to_another_worker_replays_what_was_missed(hubs, publish):
+    first, second, third = publish("first"), publish("second"), publish("third")
+
+    frames = await asyncio.wait_for(read_frames(hubs[1], 2, last_event_id=first), timeout=5)
+
+    assert frames == [f"id: {second}\ndata: second\n\n", f"id: {third}\ndata: third\n\n"]
+
+
+async def test_restarted_worker_replays_from_the_stream(redis_server, publish):
+    first = publish("first")
+    second = publish("second")
+    hub = SessionUpdateHub("redis://test", heartbeat_seconds=0.05)
+    await hub.start()
+    try:
+        assert await hub.replay(first) == [(second, "second")]
+    finally:
+        await hub.stop()
+
+
+async def test_replayed_event_is_not_sent_again_live(hubs, publish):
+    first, second = publish("first"), publish("second")
+    hub = hubs[0]
+
+    reader = asyncio.create_task(read_frames(hub, 2, last_event_id=first))
+    await asyncio.sleep(0.1)
+    # The live reader also delivers an entry published while the replay was read
+    hub.dispatch((second, "second"))
+    third = publish("third")
+    frames = await asyncio.wait_for(reader, timeout=5)
+
+    assert frames == [f"id: {second}\ndata: second\n\n", f"id: {third}\ndata: third\n\n"]
+
+
+@pytest.mark.parametrize("last_event_id", [None, "", "12", "not-an-id"])
+async def test_unknown_last_event_id_replays_nothing(hubs, publish, last_event_id):
+    publish("first")
+
+    assert await hubs[0].replay(last_event_id) == []
@@ -0,0 +1,66 @@
+"""
+The standings snapshot cache only keeps real podiums, database errors and sessions without a result stay uncached.
+"""
+
+import fakeredis
+import pytest
+from sqlalchemy import text
+
+from app.core.dependencies import get_standings_cache
+from app.models.pydantic_models import Standings
+from app.services.cache.standings_cache import StandingsCache
+from app.services.database.race_result_service import RaceResultService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def standings_cache(app):
+    cache = StandingsCache(fakeredis.FakeRedis(), fakeredis.FakeAsyncRedis())
+    app.dependency_overrides[get_standings_cache] = lambda: cache
+    return cache
+
+
+async def test_standings_are_cached(client, season, standings_cache):
+    session_key = season.session_keys[0]
+
+    response = await client.get("/f1/session_standing", params={"session_key": session_key})
+
+    assert response.status_code == 200, response.text
+    assert [position["driver_name"] for position in response.json()["standings"]] == ["Driver 1", "Driver 4", "Driver 5"]
+    assert await standings_cache.async_redis.exists(StandingsCache.key(session_key))
+
+
+async def test_session_without_result_is_not_cached(client, season, standings_cache):
+    response = await client.get("/f1/session_standing", params={"session_key": 1})
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"session_key": 1, "standings": []}
+    assert not await standings_cache.async_redis.exists(StandingsCache.key(1))
+
+
+async def test_database_error_is_a_server_error_and_not_cached(client, season, standings_cache, monkeypatch):
+    failing_query = staticmethod(lambda session_keys: text("SELECT * FROM missing_table"))
+    monkeypatch.setattr(RaceResultService, "_standings_query", failing_query)
+    session_key = season.session_keys[0]
+
+    response = await client.get("/f1/session_standing", params={"session_key": session_key})
+
+    assert response.status_code == 500
+    assert not await standings_cache.async_redis.exists(StandingsCache.key(session_key))
+
+
+async def test_waiter_builds_itself_when_the_rebuild_stored_nothing(standings_cache):
+    # A released lock and no value: the other caller built empty standings, don't wait out the timeout
+    standings_cache.wait_timeout_seconds = 30
+    await standings_cache.async_redis.set(f"{StandingsCache.key(1)}:lock", "other", px=100)
+    builds = []
+
+    async def build():
+        builds.append(1)
+        return Standings(session_key=1, standings=[])
+
+    standings = await standings_cache.get_or_build_async(1, build)
+
+    assert standings.standings == []
+    assert builds == [1]
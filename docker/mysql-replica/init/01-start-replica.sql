@@ -0,0 +1,11 @@
+-- Runs once, when the mysql-replica volume is first initialised
+CHANGE REPLICATION SOURCE TO
+    SOURCE_HOST = 'mysql',
+    SOURCE_PORT = 3306,
+    SOURCE_USER = 'replicator',
+    SOURCE_PASSWORD = 'replicatorpassword',
+    SOURCE_AUTO_POSITION = 1;
+START REPLICA;
+
+-- Only replication may write, the application only reads from here
+SET PERSIST super_read_only = ON;
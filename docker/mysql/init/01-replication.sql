@@ -0,0 +1,8 @@
+-- Runs once, when the mysql volume is first initialised
+
+-- Lets the application read replica lag (SHOW REPLICA STATUS) to decide where reads go
+GRANT REPLICATION CLIENT ON *.* TO 'f1mexicorndev'@'%';
+
+-- Account the replica profile connects with
+CREATE USER IF NOT EXISTS 'replicator'@'%' IDENTIFIED WITH mysql_native_password BY 'replicatorpassword';
+GRANT REPLICATION SLAVE ON *.* TO 'replicator'@'%';
@@ -38,4 +38,11 @@ export interface DriverStanding {
 export interface SessionStanding {
     sessionId: number;
     standings: DriverStanding[];
-}
\ No newline at end of file
+}
+
+export interface SessionDetails {
+    session_key: number;
+    drivers: Driver[];
+    guess: Guess | null;
+    standings: DriverStanding[];
+}
@@ -4,7 +4,7 @@ import { Observable, throwError } from 'rxjs';
 import { catchError, map } from 'rxjs/operators';
 import { environment } from '../../environments/environment';
 import { AuthResponse, GoogleAuthRequest, User } from '../interfaces/user.interface';
-import { Race, Driver, Guess, RaceResult, DriverStanding, SessionStanding } from '../interfaces/f1.interface';
+import { Race, Driver, Guess, RaceResult, DriverStanding, SessionStanding, SessionDetails } from '../interfaces/f1.interface';
 
 
 @Injectable({
@@ -67,6 +67,15 @@ export class ApiService {
       );
   }
 
+  // Drivers, the user's guess and standings of many sessions in one request
+  getSessionBatch(sessionKeys: number[]): Observable<SessionDetails[]> {
+    const params = { session_keys: sessionKeys.map(sessionKey => sessionKey.toString()) };
+    return this.http.get<SessionDetails[]>(`${this.baseUrl}/f1/session_batch`, { params })
+      .pipe(
+        catchError(this.handleError)
+      );
+  }
+
   getWinners(sessionKey?: number): Observable<Guess> {
     const params: { [key: string]: string } = {};
     if (sessionKey) {